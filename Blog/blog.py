@@ -1,38 +1,35 @@
+import os
+import sys
 from manim import *
 from manim.utils.color import Colors
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Common.render import FastScene
+from Common.graph import Graph as SharedGraph
+from Common.graph_spec import load_graph_spec
+
+GRAPH1 = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Dijkstra", "graph1.json")
+
+
 class Graph:
-    def __init__(self, scene, vertices_list, edges_list, weights_list, dists_list):
+    def __init__(self, scene, spec):
         self.scene = scene
 
-        # set up vertices
-        self.vertices = VGroup()
-        self.add_vertices(vertices_list) 
-
-        # set up lines
-        self.edges = VGroup()
-        self.add_edges(edges_list)
+        # set up vertices and edges
+        self.shape = SharedGraph(scene, **spec.graph_args())
+        self.vertices = self.shape.vertices
+        self.edges = self.shape.edges
 
         # set up weights
         self.weights = VGroup()
-        self.add_weights(weights_list)
+        self.add_weights(spec.label_rows("weights"))
 
         # set up dists
         self.dists = VGroup()
-        self.add_dists(dists_list)
+        self.add_dists(spec.label_rows("dists"))
 
     # Functions to convert lists to objects
     # --------------------------- #
-    def add_vertices(self, list):
-        for rad, color, opac, x, y in list:
-            v = Circle(radius=rad).set_fill(color, opacity=opac).shift(RIGHT*x + UP*y)
-            self.vertices.add(v)
-
-    def add_edges(self, list):
-        for v1, v2 in list:
-            l = Line(self.vertices[v1], self.vertices[v2])
-            self.edges.add(l)
-
     def add_weights(self, list):
         for string, size, col, x, y in list:
             text = Tex(string, font_size=size, color=col).shift(RIGHT*x + UP*y)
@@ -47,13 +44,10 @@ class Graph:
     # Show objects
     # --------------------------- #
     def create_vertices(self):
-        animations = []
-        for i in range(len(self.vertices)): 
-            animations.append(Create(self.vertices[i]))
-        self.scene.play(*animations)
+        self.shape.create_vertices()
 
     def show_edges(self):
-        self.scene.play(FadeIn(self.edges))
+        self.shape.show_edges()
 
     def ShowWeights(self):
         self.scene.play(FadeIn(self.weights))
@@ -63,53 +57,13 @@ class Graph:
     # --------------------------- #
 
 
-class Dijkstra(Scene):
+class Dijkstra(FastScene):
     def construct(self):
 
-        # radius, color, opacity, X, Y
-        graph1_vlist = [[0.3, WHITE, 1, -3.0, -2.0],
-                        [0.3, WHITE, 1, 0.3, -2.8],
-                        [0.3, WHITE, 1, 0.0, 0.0],
-                        [0.3, WHITE, 1, 4.0, 0.3],
-                        [0.3, WHITE, 1, 1.3, 2.5],
-                        [0.3, WHITE, 1, -2.5, 1.5]]
-        
-        # edges list
-        graph1_elist = [[0,1],
-                        [0,2],
-                        [0,5],
-                        [1,2],
-                        [1,3],
-                        [2,3],
-                        [2,5],
-                        [3,4],
-                        [5,4]]
-        
-        graph1_wlist = [
-                # each entry corresponds to its line in line list
-                [r"7", 35, WHITE, -1.5, -2.8],
-                [r"9", 35, WHITE, -3.1, -0.3],
-                [r"14", 35, WHITE, -1.7, -0.7], 
-                [r"10", 35, WHITE, -0.1, -1.5],
-                [r"15", 35, WHITE, 1.7, -1.2],
-                [r"11", 35, WHITE, 1.9, 0.4],
-                [r"2", 35, WHITE, -1.0, 0.9],
-                [r"6", 35, WHITE, 2.7, 1.7],
-                [r"9", 35, WHITE, -0.7, 2.3],
-
-                # start and end vertices
-                [r"a", 35, YELLOW, -3.0, -2.6],
-                [r"b", 35, YELLOW, 1.8, 2.8]]
-        
-        graph1_dlist = [
-                [r"0", 27, BLUE, -3.5, -1.5],
-                [r"inf", 27, BLUE, -0.2, -2.3],
-                [r"inf", 27, BLUE, 0.0, 0.6],
-                [r"inf", 27, BLUE, 4.0, 0.9],
-                [r"inf", 27, BLUE, 0.8, 3.0],
-                [r"inf", 27, BLUE, -3.0, 2.0]]
-
-        graph1 = Graph(self, graph1_vlist, graph1_elist, graph1_wlist, graph1_dlist)
+        # vertices, edges, weights and labels of the graph are in Dijkstra/graph1.json
+        graph1_spec = load_graph_spec(GRAPH1)
+
+        graph1 = Graph(self, graph1_spec)
         graph1.create_vertices()
         graph1.show_edges()
         graph1.ShowWeights()
@@ -0,0 +1,3 @@
+# Shared helpers for the scenes in this repository.
+# Scripts add the repository root to sys.path and import from here,
+# e.g. `from Common.dijkstra_trace import dijkstra_trace`.
@@ -0,0 +1,131 @@
+# Arrows of a state diagram, computed from (source, target) pairs of
+# states instead of hand placed coordinates. All arrows are computed in one
+# pass with NumPy:
+#   - every arrow leaves and enters the borders of its circles
+#   - arrows between the same two states are bent apart, so a -> b and
+#     b -> a (or several a -> b) do not cover each other
+#   - an arrow from a state to itself is a loop on the side of the state
+#     facing away from the middle of the diagram
+# and drawn as two mobjects, all shafts as one stroke and all tips as one
+# fill, the same way Graph draws its edges.
+
+from manim import *
+
+from Common.graph import line_points
+
+# how far arrows between the same two states bend apart, per arrow, as a
+# fraction of the distance between the states
+BEND = 0.25
+# angle from the loop direction at which a loop leaves and enters its state
+LOOP_ANGLE = 0.5
+# how far a loop's control points reach, relative to the loop size
+LOOP_REACH = 1.6
+
+
+def unit(vectors):
+    length = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, length, out=np.zeros_like(vectors), where=length > 0)
+
+
+# Rotate the 2d directions in u (with z = 0) by angle
+def rotate(u, angle):
+    c, s = np.cos(angle), np.sin(angle)
+    return np.stack([c*u[:, 0] - s*u[:, 1], s*u[:, 0] + c*u[:, 1], np.zeros(len(u))], axis=1)
+
+
+# Rank of every pair among the pairs with the same key, and the size of its group
+def rank_in_group(keys):
+    _, group, counts = np.unique(keys, axis=0, return_inverse=True, return_counts=True)
+    group = group.reshape(-1)
+    order = np.argsort(group, kind="stable")
+    first = np.cumsum(counts) - counts
+    rank = np.empty(len(keys), dtype=np.int64)
+    rank[order] = np.arange(len(keys)) - np.repeat(first, counts)
+    return rank, counts[group]
+
+
+# Shafts as (m, 4, 3) cubic bezier control points and tips as (m, 3, 3)
+# triangles for the arrows of pairs between circles with the given centers
+# and radii
+def arrow_geometry(centers, radii, pairs, tip_length=0.2, loop_size=0.4, bend=BEND):
+    centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+    radii = np.broadcast_to(np.asarray(radii, dtype=float), (len(centers),))
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    s, t = pairs[:, 0], pairs[:, 1]
+    m = len(pairs)
+    loop = s == t
+
+    start = np.empty((m, 3))
+    c1 = np.empty((m, 3))
+    c2 = np.empty((m, 3))
+    end = np.empty((m, 3))
+
+    # arrows between two states, as quadratic curves through a control point
+    # beside the middle, moved further out for every parallel arrow
+    lo, hi = np.minimum(s, t), np.maximum(s, t)
+    rank, count = rank_in_group(np.stack([lo, hi], axis=1))
+    direct = ~loop
+    a, b = centers[lo[direct]], centers[hi[direct]]
+    normal = rotate(unit(b - a), PI/2)
+    offset = (rank[direct] - (count[direct] - 1) / 2) * bend
+    control = (a + b)/2 + normal * (offset * np.linalg.norm(b - a, axis=1))[:, None]
+    cs, ct = centers[s[direct]], centers[t[direct]]
+    start[direct] = cs + unit(control - cs) * radii[s[direct], None]
+    end[direct] = ct + unit(control - ct) * radii[t[direct], None]
+    c1[direct] = start[direct] + 2/3*(control - start[direct])
+    c2[direct] = control
+
+    # loops point away from the middle of the diagram (up if that is the state)
+    c = centers[s[loop]]
+    r = radii[s[loop], None]
+    away = unit(c - centers.mean(axis=0))
+    away[~away.any(axis=1)] = UP
+    size = loop_size * (1 + 0.5*rank[loop])[:, None]
+    start[loop] = c + rotate(away, LOOP_ANGLE) * r
+    end[loop] = c + rotate(away, -LOOP_ANGLE) * r
+    c1[loop] = c + rotate(away, 2*LOOP_ANGLE) * (r + LOOP_REACH*size)
+    c2[loop] = c + rotate(away, -2*LOOP_ANGLE) * (r + LOOP_REACH*size)
+
+    # the tip ends on the border, the shaft stops at the base of the tip
+    direction = unit(end - c2)
+    base = end - direction*tip_length
+    if direct.any():
+        # the last control point of the quadratic curve, now ending at base
+        c2[direct] = base[direct] + 2/3*(c2[direct] - base[direct])
+    width = rotate(direction, PI/2) * tip_length/2
+    tips = np.stack([end, base + width, base - width], axis=1)
+    shafts = np.stack([start, c1, c2, base], axis=1)
+    return shafts, tips
+
+
+class StateArrows:
+    # The arrows for pairs of indices into circles (e.g. the pairs of an
+    # NFA). group() draws all of them, or only some, as one VGroup of a
+    # shaft stroke and a tip fill.
+    def __init__(self, circles, pairs, color=WHITE, stroke_width=4, tip_length=0.2, loop_size=0.4, bend=BEND):
+        self.pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        centers = np.array([c.get_center() for c in circles])
+        radii = np.array([c.width/2 for c in circles])
+        self.shafts, self.tips = arrow_geometry(centers, radii, self.pairs, tip_length, loop_size, bend)
+        self.color = color
+        self.stroke_width = stroke_width
+
+    # index of the arrow for (source, target)
+    def index(self, source, target):
+        return int(np.flatnonzero((self.pairs[:, 0] == source) & (self.pairs[:, 1] == target))[0])
+
+    # indices of the arrows that start and end in states
+    def among(self, states):
+        inside = np.isin(self.pairs, list(states))
+        return np.flatnonzero(inside.all(axis=1))
+
+    def group(self, index=slice(None)):
+        shafts = VMobject(color=self.color, stroke_width=self.stroke_width)
+        shafts.set_points(self.shafts[index].reshape(-1, 3))
+        triangles = self.tips[index]
+        corners = triangles.reshape(-1, 3)
+        following = np.roll(triangles, -1, axis=1).reshape(-1, 3)
+        tips = VMobject(stroke_width=0)
+        tips.set_points(line_points(corners, following))
+        tips.set_fill(self.color, opacity=1.0)
+        return VGroup(shafts, tips)
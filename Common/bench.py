@@ -0,0 +1,151 @@
+# Render every scene in the repo at fixed quality presets and record how
+# long it took, e.g.
+#
+#   python -m Common.bench -o media/bench.json
+#   python -m Common.bench -o media/bench_new.json --baseline media/bench.json
+#
+# Each render runs in its own manim process with a fresh media directory and
+# caching disabled, so LaTeX and Pango compile everything they need. The
+# shared glyph store (Common.glyph_cache) is turned off as well, so runs do
+# not depend on what earlier renders left in it, and the number of compiles
+# is the number of SVG files they leave behind.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import av
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENES = [
+    ("Dijkstra/dijkstra.py", "Dijkstra"),
+    ("Reductions/reductions.py", "Reductions"),
+    ("Transformations/transformations.py", "Transformations"),
+    ("Blog/blog.py", "Dijkstra"),
+    ("Blog/blog_ff.py", "Dijkstra"),
+    ("tests/scene.py", "Test"),
+    ("tests/grow_arrow.py", "GrowArrowExample"),
+]
+
+PRESETS = {"low": "l", "high": "h"}
+
+# Numbers compared against a baseline, and whether lower is better
+METRICS = {
+    "wall": True,
+    "fps": False,
+    "peak_rss_mb": True,
+    "latex": True,
+    "pango": True,
+    "size_mb": True,
+}
+
+
+def count_frames(path):
+    with av.open(str(path)) as video:
+        stream = video.streams.video[0]
+        if stream.frames:
+            return stream.frames
+        return sum(1 for packet in video.demux(stream) if packet.dts is not None)
+
+
+# Render one scene and measure it
+def bench_scene(script, scene_name, quality):
+    with tempfile.TemporaryDirectory() as media_dir:
+        cmd = [sys.executable, "-m", "manim", "render", "-q" + quality,
+               "--disable_caching", "--media_dir", media_dir,
+               str(ROOT / script), scene_name]
+        env = dict(os.environ, GLYPH_CACHE="off")
+        start = time.perf_counter()
+        process = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        # wait4 gives the peak RSS of this render alone
+        _, status, usage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, cmd)
+
+        output = max(Path(media_dir, "videos").rglob("*.mp4"), key=lambda p: p.stat().st_mtime)
+        frames = count_frames(output)
+        return {
+            "wall": round(wall, 3),
+            "frames": frames,
+            "fps": round(frames / wall, 2),
+            # ru_maxrss is in kilobytes on Linux
+            "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),
+            "latex": len(list(Path(media_dir, "Tex").glob("*.svg"))),
+            "pango": len(list(Path(media_dir, "texts").glob("*.svg"))),
+            "size_mb": round(output.stat().st_size / 1024 / 1024, 3),
+        }
+
+
+# Results keyed "<script>:<scene>:<preset>"; the fastest of repeat runs is kept
+def run_suite(scenes=SCENES, presets=PRESETS, repeat=1):
+    results = {}
+    for script, scene_name in scenes:
+        for preset, quality in presets.items():
+            key = "%s:%s:%s" % (script, scene_name, preset)
+            runs = [bench_scene(script, scene_name, quality) for _ in range(repeat)]
+            results[key] = min(runs, key=lambda r: r["wall"])
+            print("%-50s %8.2fs %7.1f fps" % (key, results[key]["wall"], results[key]["fps"]), flush=True)
+    return results
+
+
+# Relative change of every metric, as rows (key, metric, old, new, change)
+def compare(baseline, results):
+    rows = []
+    for key, new in results.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        for metric in METRICS:
+            if metric not in old or metric not in new:
+                continue
+            change = (new[metric] - old[metric]) / old[metric] if old[metric] else 0.0
+            rows.append((key, metric, old[metric], new[metric], change))
+    return rows
+
+
+def print_comparison(rows, threshold=0.05):
+    for key, metric, old, new, change in rows:
+        worse = change > 0 if METRICS[metric] else change < 0
+        flag = ""
+        if abs(change) >= threshold:
+            flag = "worse" if worse else "better"
+        print("%-50s %-12s %10s %10s %+7.1f%% %s" % (key, metric, old, new, 100 * change, flag))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rendering of every scene.")
+    parser.add_argument("-o", "--output", default=os.path.join("media", "bench.json"))
+    parser.add_argument("-b", "--baseline", help="earlier results to compare with")
+    parser.add_argument("-r", "--repeat", type=int, default=1)
+    parser.add_argument("-p", "--preset", action="append", choices=list(PRESETS),
+                        help="only these presets (default: all)")
+    parser.add_argument("-s", "--scene", action="append",
+                        help="only scenes whose script or name contains this")
+    args = parser.parse_args()
+
+    scenes = [s for s in SCENES if not args.scene or any(f in s[0] or f == s[1] for f in args.scene)]
+    presets = {p: q for p, q in PRESETS.items() if not args.preset or p in args.preset}
+    results = run_suite(scenes, presets, args.repeat)
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                   "results": results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        print_comparison(compare(baseline, results))
+
+
+if __name__ == "__main__":
+    main()
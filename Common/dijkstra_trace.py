@@ -0,0 +1,93 @@
+import heapq
+
+# Kinds of steps in a trace
+POP = "pop"            # u becomes the current vertex
+RELAX = "relax"        # dist[u] + w < dist[v], dist[v] is lowered
+FAIL = "fail"          # dist[u] + w >= dist[v], nothing changes
+FINALIZE = "finalize"  # every edge out of u has been checked
+
+INF = float("inf")
+
+
+# Build an adjacency list from an edge list and a matching weight list.
+# Neighbours keep the order of the edge list, so the trace follows it too.
+def adjacency(n, edges, weights, directed=False):
+    adj = [[] for _ in range(n)]
+    for (u, v), w in zip(edges, weights):
+        adj[u].append((v, w))
+        if not directed:
+            adj[v].append((u, w))
+    return adj
+
+
+# Run Dijkstra's algorithm from source and record every step.
+# Each step is a tuple (kind, u, v, w, old, new):
+#   POP       v = w = None, old = new = dist[u]
+#   RELAX     old = dist[v] before, new = dist[u] + w
+#   FAIL      old = dist[v], new = dist[u] + w (the rejected candidate)
+#   FINALIZE  v = w = None, old = new = dist[u]
+# Uses a binary heap with lazy deletion, so this is O((V + E) log V).
+# Returns the trace and the final distances.
+def dijkstra_trace(n, edges, weights, source=0, directed=False):
+    adj = adjacency(n, edges, weights, directed)
+    dist = [INF] * n
+    done = [False] * n
+    dist[source] = 0
+    heap = [(0, source)]
+    trace = []
+
+    while heap:
+        d, u = heapq.heappop(heap)
+        if done[u] or d > dist[u]:
+            continue
+        trace.append((POP, u, None, None, d, d))
+
+        for v, w in adj[u]:
+            # finalized vertices can never be improved
+            if done[v]:
+                continue
+            cand = d + w
+            if cand < dist[v]:
+                trace.append((RELAX, u, v, w, dist[v], cand))
+                dist[v] = cand
+                heapq.heappush(heap, (cand, v))
+            else:
+                trace.append((FAIL, u, v, w, dist[v], cand))
+
+        done[u] = True
+        trace.append((FINALIZE, u, None, None, d, d))
+
+    return trace, dist
+
+
+# Group a trace by frontier step: one (u, steps) pair per popped vertex u,
+# where steps are the RELAX and FAIL steps of the edges out of u.
+def frontier_steps(trace):
+    groups = []
+    for step in trace:
+        if step[0] == POP:
+            groups.append((step[1], []))
+        elif step[0] in (RELAX, FAIL):
+            groups[-1][1].append(step)
+    return groups
+
+
+# Label for a distance, e.g. "7" or "inf"
+def format_dist(d):
+    if d == INF:
+        return "inf"
+    if d == int(d):
+        return str(int(d))
+    return str(d)
+
+
+# Label for a relax or fail step, e.g. "0 + 7 < inf" or "7 + 10 > 14"
+def format_compare(step):
+    kind, u, v, w, old, new = step
+    if kind == RELAX:
+        sign = "<"
+    elif new > old:
+        sign = ">"
+    else:
+        sign = "="
+    return "%s + %s %s %s" % (format_dist(new - w), format_dist(w), sign, format_dist(old))
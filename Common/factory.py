@@ -0,0 +1,122 @@
+import copy
+import functools
+import weakref
+from manim import *
+
+
+class SharedPoints(np.ndarray):
+    # Point array shared by a prototype and all of its copies. It is
+    # read-only, and augmented assignments such as `mob.points -= p` (which
+    # Mobject.scale and rotate use) return a new array instead of writing
+    # into it, so a copy gets its own points the first time it changes.
+    # Every copy holds its own view of the shared points that knows the
+    # copy, so item assignments such as `mob.points[i::4] = ...` (e.g.
+    # VMobject.set_anchors_and_handles) also first give it its own points.
+    def __array_finalize__(self, obj):
+        # views and slices are not tied to a mobject
+        self.owner = None
+        self.detached = None
+
+    def __setitem__(self, index, value):
+        if self.detached is None:
+            owner = self.owner() if self.owner is not None else None
+            if owner is None:
+                # the prototype itself, which must not change
+                return super().__setitem__(index, value)
+            self.detached = np.array(self)
+            owner.points = self.detached
+        # later writes through this view still reach the copy's own points
+        self.detached[index] = value
+
+    def __iadd__(self, other):
+        return np.asarray(self) + other
+
+    def __isub__(self, other):
+        return np.asarray(self) - other
+
+    def __imul__(self, other):
+        return np.asarray(self) * other
+
+    def __itruediv__(self, other):
+        return np.asarray(self) / other
+
+    # results of math on shared points are ordinary arrays
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        inputs = [np.asarray(x) if isinstance(x, SharedPoints) else x for x in inputs]
+        if "out" in kwargs:
+            kwargs["out"] = tuple(np.asarray(x) if isinstance(x, SharedPoints) else x for x in kwargs["out"])
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+
+# All mobjects in a factory result (a mobject, or a tuple or list of them)
+def family(result):
+    if isinstance(result, Mobject):
+        return result.get_family()
+    if isinstance(result, (list, tuple)):
+        return [mob for item in result for mob in family(item)]
+    return []
+
+
+# Make the point arrays of a prototype shareable
+def freeze(result):
+    for mob in family(result):
+        points = np.asarray(mob.points).view(SharedPoints)
+        points.flags.writeable = False
+        mob.points = points
+    return result
+
+
+# View of shared points that belongs to mob
+def owned_view(points, mob):
+    view = points.view(SharedPoints)
+    view.owner = weakref.ref(mob)
+    return view
+
+
+# Deep copy of a frozen prototype that reuses its point arrays
+def share_copy(result):
+    memo = {}
+    for mob in family(result):
+        memo[id(mob.points)] = mob.points
+    result = copy.deepcopy(result, memo)
+    for mob in family(result):
+        if isinstance(mob.points, SharedPoints):
+            mob.points = owned_view(mob.points, mob)
+    return result
+
+
+class FactoryCache:
+    # Prototypes built by scene factory methods, keyed by method and arguments
+    def __init__(self):
+        self.prototypes = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, build):
+        if key in self.prototypes:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.prototypes[key] = freeze(build())
+        return share_copy(self.prototypes[key])
+
+    def report(self):
+        logger.info("Factories: %d hits, %d misses", self.hits, self.misses)
+
+
+def factory_cache(scene):
+    if not hasattr(scene, "factories"):
+        scene.factories = FactoryCache()
+    return scene.factories
+
+
+# Decorator for scene methods that build mobjects. The first call with
+# some arguments builds a prototype; every call returns a fresh copy of it.
+def factory(method):
+    @functools.wraps(method)
+    def wrapper(scene, *args, **kwargs):
+        # keyed by repr, so lists of positions, colors and other unhashable
+        # arguments can be part of the key
+        key = (method.__name__, tuple(repr(a) for a in args), tuple(sorted((k, repr(v)) for k, v in kwargs.items())))
+        return factory_cache(scene).get(key, lambda: method(scene, *args, **kwargs))
+    return wrapper
@@ -0,0 +1,212 @@
+# A content-addressed store of the SVG files that Tex, MathTex, Text and
+# MarkupText compile to, shared by every scene, media directory and worker
+# process on the machine, e.g.
+#
+#   python -m Common.glyph_cache stats
+#   python -m Common.glyph_cache evict --max-size 128
+#   python -m Common.glyph_cache clear
+#
+# manim already keeps these SVGs in media/Tex and media/texts, but only
+# per media directory, so a scene rendered from another directory, or a
+# section worker of Common.sections with its own media directory, compiles
+# everything again. With the store installed (FastScene does this unless
+# GLYPH_CACHE=off), a missing SVG is first looked up in the store and
+# linked into the media directory; only a real miss runs LaTeX or Pango,
+# and its result is added to the store.
+#
+# The store lives in media/glyph_cache at the top of the repository (or
+# GLYPH_CACHE_DIR) as <key[:2]>/<key>.svg. Files are written under a temporary
+# name and moved into place, so readers never see half written SVGs. A hit
+# bumps the file's mtime, and the least recently used files are removed
+# once the store grows past GLYPH_CACHE_MB megabytes (256 by default).
+# Scenes only read their own copies in the media directory, so eviction
+# never removes a file that is in use.
+
+import argparse
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import manim
+from manim import *
+import manim.mobject.text.tex_mobject as tex_mobject
+from manim.utils.tex_file_writing import tex_hash
+
+DEFAULT_DIR = Path(__file__).resolve().parent.parent / "media" / "glyph_cache"
+DEFAULT_MB = 256
+
+
+def cache_dir():
+    return Path(os.environ.get("GLYPH_CACHE_DIR") or DEFAULT_DIR)
+
+
+def cache_bytes():
+    return int(float(os.environ.get("GLYPH_CACHE_MB", DEFAULT_MB)) * 1024 * 1024)
+
+
+def cache_enabled():
+    return os.environ.get("GLYPH_CACHE", "").lower() not in ("off", "0", "no")
+
+
+# Write source to target under a temporary name and move it into place,
+# linking instead of copying when both are on the same file system
+def place(source, target):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, partial = tempfile.mkstemp(dir=target.parent, suffix=".part")
+    os.close(fd)
+    try:
+        os.unlink(partial)
+        os.link(source, partial)
+    except OSError:
+        shutil.copyfile(source, partial)
+    os.replace(partial, target)
+
+
+class GlyphCache:
+    def __init__(self, directory, max_bytes):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.added = 0
+
+    def path(self, key):
+        return self.directory / key[:2] / (key + ".svg")
+
+    # Copy the SVG for key to target if the store has it
+    def fetch(self, key, target):
+        path = self.path(key)
+        try:
+            os.utime(path)
+            place(path, target)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+
+    def put(self, key, source):
+        path = self.path(key)
+        if not path.exists():
+            place(source, path)
+            self.added += 1
+
+    def files(self):
+        return [(p, p.stat()) for p in self.directory.glob("*/*.svg")]
+
+    # Remove the least recently used files until the store fits in max_bytes
+    def evict(self, max_bytes=None):
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        files = sorted(self.files(), key=lambda f: f[1].st_mtime)
+        total = sum(stat.st_size for _, stat in files)
+        removed = 0
+        for path, stat in files:
+            if total <= max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                # another process evicted it first
+                pass
+            total -= stat.st_size
+            removed += 1
+        return removed
+
+    def report(self):
+        logger.info("Glyph cache: %d hits, %d misses, %d added", self.hits, self.misses, self.added)
+
+
+GLYPHS = None
+
+
+# The LaTeX source manim compiles for a Tex expression
+def tex_code(expression, environment, tex_template):
+    if environment is not None:
+        return tex_template.get_texcode_for_expression_in_env(expression, environment)
+    return tex_template.get_texcode_for_expression(expression)
+
+
+def cached_tex_to_svg_file(original):
+    def tex_to_svg_file(expression, environment=None, tex_template=None):
+        if tex_template is None:
+            tex_template = config["tex_template"]
+        code = tex_code(expression, environment, tex_template)
+        # where manim keeps this SVG in the current media directory
+        local = config.get_dir("tex_dir") / (tex_hash(code) + ".svg")
+        if local.exists():
+            return local
+        # the key also covers how the source is compiled
+        key = hashlib.sha256(("tex %s %s %s %s" % (
+            manim.__version__, tex_template.tex_compiler, tex_template.output_format, code)).encode()).hexdigest()[:32]
+        if GLYPHS.fetch(key, local):
+            return local
+        svg = original(expression, environment, tex_template)
+        GLYPHS.put(key, svg)
+        return svg
+    return tex_to_svg_file
+
+
+# Text SVGs also depend on the pixel size, which manim's own hash leaves out
+def cached_text2svg(original):
+    def _text2svg(self, color):
+        name = self._text2hash(color)
+        local = config.get_dir("text_dir") / (name + ".svg")
+        if not local.exists():
+            key = hashlib.sha256(("%s %s %s %d %d" % (
+                type(self).__name__, manim.__version__, name, config["pixel_width"], config["pixel_height"])).encode()
+            ).hexdigest()[:32]
+            if not GLYPHS.fetch(key, local):
+                svg = original(self, color)
+                GLYPHS.put(key, svg)
+                return svg
+        return original(self, color)
+    return _text2svg
+
+
+# Route Tex and Text compilation through the store (once per process)
+def install():
+    global GLYPHS
+    if GLYPHS is not None or not cache_enabled():
+        return GLYPHS
+    GLYPHS = GlyphCache(cache_dir(), cache_bytes())
+    tex_mobject.tex_to_svg_file = cached_tex_to_svg_file(tex_mobject.tex_to_svg_file)
+    Text._text2svg = cached_text2svg(Text._text2svg)
+    MarkupText._text2svg = cached_text2svg(MarkupText._text2svg)
+    return GLYPHS
+
+
+def format_bytes(n):
+    for unit in ["B", "KB", "MB", "GB"]:
+        if n < 1024 or unit == "GB":
+            return "%.1f %s" % (n, unit)
+        n /= 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or trim the shared Tex/Text SVG cache.")
+    parser.add_argument("command", choices=["stats", "evict", "clear"])
+    parser.add_argument("--dir", default=None, help="cache directory (default: GLYPH_CACHE_DIR or %s)" % DEFAULT_DIR)
+    parser.add_argument("--max-size", type=float, default=None, help="size in MB to evict down to")
+    args = parser.parse_args()
+
+    cache = GlyphCache(args.dir or cache_dir(), cache_bytes())
+    if args.command == "stats":
+        files = cache.files()
+        total = sum(stat.st_size for _, stat in files)
+        print("%s: %d files, %s of %s" % (cache.directory, len(files), format_bytes(total), format_bytes(cache.max_bytes)))
+        if files:
+            used = sorted(stat.st_mtime for _, stat in files)
+            now = time.time()
+            print("last used %.1f h ago, least recently used %.1f h ago" % ((now - used[-1]) / 3600, (now - used[0]) / 3600))
+    elif args.command == "evict":
+        max_bytes = None if args.max_size is None else int(args.max_size * 1024 * 1024)
+        print("removed %d files" % cache.evict(max_bytes))
+    else:
+        print("removed %d files" % cache.evict(0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+from manim import *
+
+from Common.layout import auto_layout
+
+
+# Points for straight lines from starts[i] to ends[i], as one cubic bezier
+# curve (four points) per line, computed for all lines at once.
+# Each line is pulled back by the given radii at its ends, so it meets the
+# borders of circles the same way Line(circle1, circle2) does.
+def line_points(starts, ends, start_radii=0.0, end_radii=0.0):
+    starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+    ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+    start_radii = np.asarray(start_radii, dtype=float).reshape(-1, 1)
+    end_radii = np.asarray(end_radii, dtype=float).reshape(-1, 1)
+
+    diff = ends - starts
+    length = np.linalg.norm(diff, axis=1, keepdims=True)
+    unit = np.divide(diff, length, out=np.zeros_like(diff), where=length > 0)
+    a = starts + unit*start_radii
+    b = ends - unit*end_radii
+
+    points = np.empty((len(a), 4, 3))
+    points[:, 0] = a
+    points[:, 1] = a + (b - a)/3
+    points[:, 2] = a + 2*(b - a)/3
+    points[:, 3] = b
+    return points.reshape(-1, 3)
+
+
+# All lines as a single stroke mobject, so a frame draws one path
+# instead of one Line mobject per edge.
+def merged_lines(starts, ends, start_radii=0.0, end_radii=0.0, **kwargs):
+    lines = VMobject(**kwargs)
+    lines.set_points(line_points(starts, ends, start_radii, end_radii))
+    return lines
+
+
+class Graph:
+    # Vertex positions, radii, colors and opacities live in NumPy arrays and
+    # the edges are an (E, 2) index array. Vertices are still one Circle each
+    # so they can be highlighted one at a time; all edges are one merged
+    # stroke mobject whose geometry is computed in a single pass.
+    def __init__(self, scene, positions, edges, radii=0.3, colors=WHITE, opacities=1.0):
+        self.scene = scene
+
+        positions = np.asarray(positions, dtype=float)
+        n = len(positions)
+        self.positions = np.zeros((n, 3))
+        self.positions[:, :positions.shape[1]] = positions
+        self.radii = np.broadcast_to(np.asarray(radii, dtype=float), (n,)).copy()
+        self.opacities = np.broadcast_to(np.asarray(opacities, dtype=float), (n,)).copy()
+        if isinstance(colors, np.ndarray) and colors.ndim == 2:
+            self.colors = colors[:, :3].astype(float)
+        elif isinstance(colors, (list, tuple)):
+            self.colors = np.array([ManimColor(c).to_rgb() for c in colors])
+        else:
+            self.colors = np.tile(ManimColor(colors).to_rgb(), (n, 1))
+        self.edge_index = np.asarray(edges, dtype=int).reshape(-1, 2)
+
+        # set up vertices
+        self.vertices = VGroup()
+        self.add_vertices()
+
+        # set up edges
+        self.edges = merged_lines(*self.edge_ends())
+
+        # set up graph
+        self.graph = VGroup(self.vertices, self.edges)
+
+    # Build a graph from the [radius, color, opacity, x, y] rows the scenes use
+    @classmethod
+    def from_lists(cls, scene, vertices_list, edges_list):
+        radii = [v[0] for v in vertices_list]
+        colors = [v[1] for v in vertices_list]
+        opacities = [v[2] for v in vertices_list]
+        positions = [[v[3], v[4]] for v in vertices_list]
+        return cls(scene, positions, edges_list, radii, colors, opacities)
+
+    # Circles are copies of one unit circle, scaled and moved with array math
+    def add_vertices(self):
+        unit = Circle(radius=1)
+        for pos, rad, rgb, opac in zip(self.positions, self.radii, self.colors, self.opacities):
+            v = unit.copy()
+            v.set_points(unit.points*rad + pos)
+            v.set_fill(ManimColor(rgb), opacity=opac)
+            self.vertices.add(v)
+
+    # Start points, end points and radii at both ends of every edge
+    def edge_ends(self, index=slice(None)):
+        v1 = self.edge_index[index, 0]
+        v2 = self.edge_index[index, 1]
+        return self.positions[v1], self.positions[v2], self.radii[v1], self.radii[v2]
+
+    # A separate Line over edge i, e.g. to highlight or blink it
+    def edge(self, i, **kwargs):
+        start, end = line_points(*self.edge_ends([i])).reshape(4, 3)[[0, 3]]
+        return Line(start, end, **kwargs)
+
+    def highlight_edge(self, i, color=YELLOW):
+        return self.edge(i, color=color, stroke_width=self.edges.get_stroke_width() + 2)
+
+    # Simultaneously create all vertices
+    def create_vertices(self):
+        self.scene.play(*[Create(v) for v in self.vertices])
+
+    def show_edges(self):
+        self.scene.play(FadeIn(self.edges))
+
+    def fade_out_vertices(self):
+        self.scene.play(FadeOut(self.vertices))
+
+    def add(self):
+        self.scene.add(self.vertices, self.edges)
+
+
+# n points evenly spaced on a circle, counterclockwise from start_angle
+def circle_layout(n, radius=1.7, center=ORIGIN, start_angle=PI/2):
+    angles = start_angle + TAU*np.arange(n)/n
+    points = np.stack([np.cos(angles), np.sin(angles), np.zeros(n)], axis=1)
+    return np.asarray(center, dtype=float) + radius*points
+
+
+# Every undirected edge of K_n exactly once (i < j), numbered from offset
+def complete_edges(n, offset=0):
+    i, j = np.triu_indices(n, k=1)
+    return np.stack([i, j], axis=1) + offset
+
+
+# K_n with its vertices on a circle.
+# style is passed on to Graph (radii, colors, opacities).
+def complete_graph(scene, n, radius=1.7, center=ORIGIN, **style):
+    return Graph(scene, circle_layout(n, radius, center), complete_edges(n), **style)
+
+
+# Any graph on n vertices, placed by the force-directed layout into a
+# width x height box around center
+def auto_graph(scene, n, edges, width=12.0, height=6.0, center=ORIGIN, **style):
+    return Graph(scene, auto_layout(n, edges, width, height, center), edges, **style)
+
+
+# A (k, k)-dumbbell: two K_k side by side, distance apart, joined by a
+# single edge between the two vertices closest to each other.
+def dumbbell_graph(scene, k, radius=1.7, distance=5.0, center=ORIGIN, **style):
+    center = np.asarray(center, dtype=float)
+    left = circle_layout(k, radius, center + LEFT*distance/2)
+    right = circle_layout(k, radius, center + RIGHT*distance/2)
+    bridge = [np.argmax(left[:, 0]), k + np.argmin(right[:, 0])]
+    edges = np.vstack([complete_edges(k), complete_edges(k, k), [bridge]])
+    return Graph(scene, np.vstack([left, right]), edges, **style)
+
+
+# K_k plus extra vertices. Extra vertices are numbered from k, and
+# extra_edges may use both clique and extra vertex numbers.
+def clique_plus_graph(scene, k, extra_positions, extra_edges, radius=1.7, center=ORIGIN, **style):
+    extra = np.zeros((len(extra_positions), 3))
+    extra[:, :2] = np.asarray(extra_positions, dtype=float)[:, :2]
+    positions = np.vstack([circle_layout(k, radius, center), extra])
+    edges = np.vstack([complete_edges(k), np.asarray(extra_edges, dtype=int).reshape(-1, 2)])
+    return Graph(scene, positions, edges, **style)
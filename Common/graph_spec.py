@@ -0,0 +1,203 @@
+# Graphs stored outside the scene scripts.
+#
+# A spec is a JSON file with the same rows the scenes used to write inline:
+#   vertices  [radius, color, opacity, x, y]
+#   edges     [u, v]
+#   weights   one number per edge (optional)
+#   labels    {group: [[text, font size, color, x, y], ...]} (optional)
+# Colors are manim color names or hex strings.
+#
+# Vertex rows may leave out x and y (all of them or none); the vertices are
+# then placed by Common.layout into the box given by the optional
+#   layout    {"width": 12, "height": 6, "center": [x, y], "seed": 0}
+# and label rows can be placed relative to the graph with
+# [text, font size, color, "vertex", i] (above vertex i) or
+# [text, font size, color, "edge", i] (beside the middle of edge i).
+#
+# The first load checks the spec and compiles it into one .npy file per
+# array in __pycache__ next to the JSON, replacing the files of earlier
+# versions of the spec. Later loads memory-map those files, so large graphs
+# load without parsing anything, and several scenes or processes reading
+# the same spec share the pages.
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from manim import *
+
+from Common.layout import auto_layout
+
+# bump when the layout of the compiled files changes
+FORMAT = 2
+
+# distance of placed labels from their vertex or edge
+LABEL_GAP = 0.3
+
+
+class GraphSpec:
+    # Arrays of a compiled spec:
+    #   positions (n, 3), radii (n,), colors (n, 3) rgb, opacities (n,)
+    #   edges (E, 2), weights (E,)
+    #   labels[group] = {"text", "size", "color", "position"} arrays
+    def __init__(self, arrays, labels):
+        self.positions = arrays["positions"]
+        self.radii = arrays["radii"]
+        self.colors = arrays["colors"]
+        self.opacities = arrays["opacities"]
+        self.edges = arrays["edges"]
+        self.weights = arrays["weights"]
+        self.labels = labels
+
+    @property
+    def n(self):
+        return len(self.positions)
+
+    # Keyword arguments for Common.graph.Graph
+    def graph_args(self):
+        return dict(positions=self.positions, edges=self.edges, radii=self.radii,
+                    colors=self.colors, opacities=self.opacities)
+
+    # A label group as [text, font size, color, x, y] rows
+    def label_rows(self, group):
+        arrays = self.labels[group]
+        return [[str(text), int(size), ManimColor(rgb), float(pos[0]), float(pos[1])]
+                for text, size, rgb, pos in zip(arrays["text"], arrays["size"], arrays["color"], arrays["position"])]
+
+
+def to_rgb(colors):
+    return np.array([ManimColor(c).to_rgb() for c in colors], dtype=float).reshape(-1, 3)
+
+
+def to_positions(xy):
+    positions = np.zeros((len(xy), 3))
+    if len(xy):
+        positions[:, :2] = np.asarray(xy, dtype=float)
+    return positions
+
+
+# Position of a label row, which is either x, y or placed at a vertex or edge
+def label_position(row, positions, radii, edges):
+    kind, value = row[3], row[4]
+    if kind == "vertex":
+        return positions[value, :2] + [0, radii[value] + LABEL_GAP]
+    if kind == "edge":
+        a, b = positions[edges[value], :2]
+        direction = b - a
+        normal = np.array([-direction[1], direction[0]]) / max(np.linalg.norm(direction), 1e-9)
+        # on the upper side of the edge
+        if normal[1] < 0:
+            normal = -normal
+        return (a + b) / 2 + normal*LABEL_GAP
+    return [kind, value]
+
+
+def label_arrays(rows, positions, radii, edges):
+    return {
+        "text": np.array([str(r[0]) for r in rows]),
+        "size": np.array([r[1] for r in rows], dtype=float),
+        "color": to_rgb([r[2] for r in rows]),
+        "position": to_positions([label_position(r, positions, radii, edges) for r in rows]),
+    }
+
+
+# Check a parsed spec and turn it into arrays
+def compile_spec(spec):
+    vertices = spec["vertices"]
+    placed = all(len(v) == 5 for v in vertices)
+    if not placed and any(len(v) != 3 for v in vertices):
+        raise ValueError("vertex rows must all be [radius, color, opacity, x, y] or all [radius, color, opacity]")
+    arrays = {
+        "radii": np.array([v[0] for v in vertices], dtype=float),
+        "colors": to_rgb([v[1] for v in vertices]),
+        "opacities": np.array([v[2] for v in vertices], dtype=float),
+        "edges": np.asarray(spec.get("edges", []), dtype=np.int64).reshape(-1, 2),
+    }
+    n = len(vertices)
+    edges = arrays["edges"]
+    if len(edges) and (edges.min() < 0 or edges.max() >= n):
+        raise ValueError("edges must join vertices 0..%d" % (n - 1))
+
+    if placed:
+        arrays["positions"] = to_positions([v[3:5] for v in vertices])
+    else:
+        layout = spec.get("layout", {})
+        center = list(layout.get("center", [0, 0])) + [0]
+        arrays["positions"] = auto_layout(n, edges, layout.get("width", 12.0), layout.get("height", 6.0),
+                                          center, seed=layout.get("seed", 0))
+
+    weights = np.asarray(spec.get("weights", np.ones(len(edges))))
+    if len(weights) != len(edges):
+        raise ValueError("%d weights for %d edges" % (len(weights), len(edges)))
+    if len(weights) and weights.min() < 0:
+        raise ValueError("weights must not be negative")
+    # whole numbers stay integers, so labels read "14" and not "14.0"
+    if np.all(np.mod(weights, 1) == 0):
+        weights = weights.astype(np.int64)
+    arrays["weights"] = weights
+
+    labels = {}
+    for group, rows in spec.get("labels", {}).items():
+        if any(len(r) != 5 for r in rows):
+            raise ValueError("label rows in %r must be [text, size, color, x, y] or [text, size, color, vertex/edge, i]"
+                             % group)
+        for r in rows:
+            if r[3] == "vertex" and not 0 <= r[4] < n or r[3] == "edge" and not 0 <= r[4] < len(edges):
+                raise ValueError("label %r in %r is placed at a missing %s" % (r[0], group, r[3]))
+        labels[group] = label_arrays(rows, arrays["positions"], arrays["radii"], edges)
+    return arrays, labels
+
+
+def save_compiled(directory, arrays, labels):
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    # write everything into a temporary directory and move it into place,
+    # so another process never sees a half written cache
+    tmp = Path(tempfile.mkdtemp(dir=directory.parent))
+    for name, array in arrays.items():
+        np.save(tmp / (name + ".npy"), array)
+    for group, group_arrays in labels.items():
+        for name, array in group_arrays.items():
+            np.save(tmp / ("label.%s.%s.npy" % (group, name)), array)
+    try:
+        os.replace(tmp, directory)
+    except OSError:
+        # another process compiled the same spec first
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def load_compiled(directory):
+    arrays = {}
+    labels = {}
+    for path in directory.glob("*.npy"):
+        array = np.load(path, mmap_mode="r")
+        if path.stem.startswith("label."):
+            # group names may contain dots, array names do not
+            group, name = path.stem[len("label."):].rsplit(".", 1)
+            labels.setdefault(group, {})[name] = array
+        else:
+            arrays[path.stem] = array
+    return arrays, labels
+
+
+# Remove the compiled files of earlier versions of the spec at path
+def remove_stale(path, current):
+    for directory in current.parent.glob("%s.*.graph" % path.stem):
+        if directory != current and directory.name[:-len(".graph")].rsplit(".", 1)[0] == path.stem:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+# Load a spec, compiling it first if the JSON changed since the last load
+def load_graph_spec(path):
+    path = Path(path)
+    source = path.read_bytes()
+    digest = hashlib.sha256(source + b"%d" % FORMAT).hexdigest()[:16]
+    directory = path.parent / "__pycache__" / ("%s.%s.graph" % (path.stem, digest))
+
+    if not directory.is_dir():
+        arrays, labels = compile_spec(json.loads(source))
+        save_compiled(directory, arrays, labels)
+        remove_stale(path, directory)
+    return GraphSpec(*load_compiled(directory))
@@ -0,0 +1,139 @@
+# The half(L) construction from Transformations: given an NFA M for L,
+# the NFA M' for half(L) = {w | ww in L} has the states
+#   Q' = (Q x Q x Q) u {s'}
+# where (p, h, q) means "M is in p after reading from its start, h is the
+# guessed halfway state, and M is in q after reading from h", and
+#   delta'(s', eps)        = {(s, h, h) | h in Q}
+#   delta'((p, h, q), a)   = {(p2, h, q2) | p2 in delta(p, a), q2 in delta(q, a)}
+#   A'                     = {(h, h, q) | h in Q, q in A}
+#
+# Only the triples reachable from s' are built, a whole frontier at a time
+# with NumPy, instead of all |Q|^3 of them. A triple is stored as the
+# integer (p*|Q| + h)*|Q| + q.
+
+import numpy as np
+
+from Common.nfa import NFA, bits
+
+
+# The rows of an NFA transition table (bitmasks per state) as CSR arrays
+def csr(rows):
+    targets = [list(bits(mask)) for mask in rows]
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(t) for t in targets])
+    indices = np.array([q for t in targets for q in t], dtype=np.int64)
+    return indptr, indices
+
+
+class HalfNFA:
+    def __init__(self, nfa):
+        self.nfa = nfa
+        self.n = nfa.n
+        self.alphabet = nfa.alphabet
+        self.tables = {symbol: csr(nfa.delta[symbol]) for symbol in self.alphabet}
+        self.accepting_states = np.array(list(bits(nfa.accepting)), dtype=np.int64)
+
+        # delta'(s', eps) = {(s, h, h)}, closed: p in the closure of s, q in the closure of h
+        cptr, cidx = csr(nfa.closures)
+        start_p = cidx[cptr[nfa.start]:cptr[nfa.start + 1]]
+        h = np.repeat(np.arange(self.n), np.diff(cptr))
+        self.start = np.unique(self.encode(start_p[:, None], h[None, :], cidx[None, :]).ravel())
+
+        # filled in by build()
+        self.states = None
+        self.edges = {}
+
+    def encode(self, p, h, q):
+        return (p * self.n + h) * self.n + q
+
+    def decode(self, codes):
+        pq, q = np.divmod(codes, self.n)
+        p, h = np.divmod(pq, self.n)
+        return p, h, q
+
+    # All successors of the triples in codes on symbol, as (sources, targets)
+    def successors(self, codes, symbol):
+        indptr, indices = self.tables[symbol]
+        p, h, q = self.decode(codes)
+        dp = indptr[p + 1] - indptr[p]
+        dq = indptr[q + 1] - indptr[q]
+        count = dp * dq
+        owner = np.repeat(np.arange(len(codes)), count)
+        # position of every successor within the dp x dq block of its triple
+        offset = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+        pi, qi = np.divmod(offset, dq[owner]) if len(owner) else (offset, offset)
+        p2 = indices[indptr[p[owner]] + pi]
+        q2 = indices[indptr[q[owner]] + qi]
+        return codes[owner], self.encode(p2, h[owner], q2)
+
+    def step(self, codes, symbol):
+        if symbol not in self.tables:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(self.successors(codes, symbol)[1])
+
+    def is_accepting(self, codes):
+        p, h, q = self.decode(codes)
+        return (p == h) & np.isin(q, self.accepting_states)
+
+    def accepts(self, word):
+        codes = self.start
+        for symbol in word:
+            codes = self.step(codes, symbol)
+        return bool(self.is_accepting(codes).any())
+
+    # Explore every triple reachable from s', one frontier at a time
+    def build(self):
+        states = self.start
+        frontier = self.start
+        edges = {symbol: [] for symbol in self.alphabet}
+        while len(frontier):
+            found = []
+            for symbol in self.alphabet:
+                sources, targets = self.successors(frontier, symbol)
+                edges[symbol].append((sources, targets))
+                found.append(targets)
+            # an NFA without transitions has no symbols to follow
+            found = np.unique(np.concatenate(found)) if found else np.empty(0, np.int64)
+            frontier = np.setdiff1d(found, states, assume_unique=True)
+            states = np.union1d(states, frontier)
+
+        self.states = states
+        self.edges = {symbol: (np.concatenate([s for s, _ in parts]), np.concatenate([t for _, t in parts]))
+                      for symbol, parts in edges.items()}
+        return self
+
+    # Reachable states of M', counting s'
+    @property
+    def reachable(self):
+        return len(self.states) + 1
+
+    # |Q'| of the full construction
+    @property
+    def full_size(self):
+        return self.n ** 3 + 1
+
+    def report(self):
+        return "half(L) NFA: %d reachable states of %d (%.2f%%)" % (
+            self.reachable, self.full_size, 100 * self.reachable / self.full_size)
+
+    def name(self, code):
+        p, h, q = (int(x) for x in self.decode(np.int64(code)))
+        names = self.nfa.names
+        return "(%s, %s, %s)" % (names[p], names[h], names[q])
+
+    # The built M' as an NFA, with s' and the triples named "(p, h, q)"
+    def to_nfa(self):
+        if self.states is None:
+            self.build()
+        names = ["s'"] + [self.name(code) for code in self.states]
+        index = {int(code): i + 1 for i, code in enumerate(self.states)}
+        transitions = {(0, ""): [index[int(code)] for code in self.start]}
+        for symbol, (sources, targets) in self.edges.items():
+            for source, target in zip(sources.tolist(), targets.tolist()):
+                transitions.setdefault((index[source], symbol), []).append(index[target])
+        accepting = [index[int(code)] for code in self.states[self.is_accepting(self.states)]]
+        return NFA(names, 0, accepting, transitions)
+
+
+def half_construction(nfa):
+    return HalfNFA(nfa).build()
@@ -0,0 +1,133 @@
+import re
+from manim import *
+
+# Every glyph a distance or comparison label can be made of
+GLYPHS = ["0", "1", "2", "3", "4", "5", "6", "7", "8", "9", ".", "-", "inf", "+", "<", ">", "="]
+
+# "-" is set as a minus sign, not a hyphen
+TEXT_GLYPHS = {"-": "\u2212"}
+
+TOKENS = re.compile(r"inf|\d|[.+<>=-]| +")
+
+
+class LabelAtlas:
+    # Sets all GLYPHS once for a font size and color (a single Pango run, so
+    # no TeX installation is needed), then builds label strings such as "22"
+    # or "14 + 11 > 22" from copies of the cached glyph paths.
+    def __init__(self, font_size, color):
+        self.font_size = font_size
+        self.color = color
+
+        # glyph -> (mobject centered on x = 0, width)
+        self.glyphs = None
+        self.space = 0
+        self.kern = 0
+
+        # how many labels were built, and how many Pango runs that took
+        self.labels = 0
+        self.compiles = 0
+
+    # Pango runs avoided compared to one Text per label
+    @property
+    def saved(self):
+        return self.labels - self.compiles
+
+    # One mobject per glyph, in GLYPHS order and a word space apart
+    def render_glyphs(self):
+        strings = [TEXT_GLYPHS.get(g, g) for g in GLYPHS]
+        text = Text(" ".join(strings), font_size=self.font_size, color=self.color)
+        # Text has one submobject per character, so "inf" takes three
+        rendered = []
+        i = 0
+        for string in strings:
+            rendered.append(VGroup(*text[i:i + len(string)]))
+            i += len(string)
+        return rendered
+
+    def compile(self):
+        rendered = self.render_glyphs()
+        self.compiles += 1
+
+        # glyphs keep their height above the baseline, which is the bottom of "0"
+        baseline = rendered[0].get_bottom()[1]
+        self.glyphs = {}
+        for glyph, mob in zip(GLYPHS, rendered):
+            width = mob.width
+            mob = mob.copy()
+            mob.move_to(np.array([0, mob.get_center()[1] - baseline, 0]))
+            self.glyphs[glyph] = (mob, width)
+
+        # the word gap between "0" and "1", and a much smaller gap inside numbers
+        self.space = rendered[1].get_left()[0] - rendered[0].get_right()[0]
+        self.kern = 0.15 * self.space
+
+    # Build a label centered at the origin, like Tex(string) would be
+    def label(self, string):
+        tokens = TOKENS.findall(string)
+        if "".join(tokens) != string:
+            raise ValueError("label %r has characters that are not in GLYPHS" % string)
+        if self.glyphs is None:
+            self.compile()
+        self.labels += 1
+
+        group = VGroup()
+        x = 0
+        gap = 0
+        for token in tokens:
+            if token.isspace():
+                gap = self.space
+                continue
+            mob, width = self.glyphs[token]
+            x += gap
+            group.add(mob.copy().shift(RIGHT*(x + width/2)))
+            x += width
+            gap = self.kern
+
+        return group.move_to(ORIGIN)
+
+
+class NumberLabel(VGroup):
+    # A label whose value can be changed in place, e.g. from "inf" to
+    # "0 + 7 < inf" and then to "7". The new glyphs are copies of cached
+    # paths, so an update never runs Pango, and the label keeps its center
+    # and stays the same mobject (already added to the scene or a group).
+    def __init__(self, string, font_size, color, atlas=None, **kwargs):
+        super().__init__(**kwargs)
+        self.atlas = atlas or get_atlas(font_size, color)
+        self.value = None
+        self.set_value(string)
+
+    # Show a new string, optionally in the style of another atlas
+    def set_value(self, string, atlas=None):
+        if atlas is not None:
+            self.atlas = atlas
+        center = self.get_center() if self.submobjects else ORIGIN
+        glyphs = self.atlas.label(string)
+        self.remove(*self.submobjects)
+        self.add(*glyphs.submobjects)
+        self.move_to(center)
+        self.value = string
+        return self
+
+
+# One atlas per (font size, color), shared by everything in the process
+ATLASES = {}
+
+
+def get_atlas(font_size, color):
+    key = (font_size, str(color))
+    if key not in ATLASES:
+        ATLASES[key] = LabelAtlas(font_size, color)
+    return ATLASES[key]
+
+
+def label(string, font_size, color):
+    return get_atlas(font_size, color).label(string)
+
+
+# Log how many glyph compiles (Pango runs) the atlases saved
+def report_labels():
+    labels = sum(a.labels for a in ATLASES.values())
+    compiles = sum(a.compiles for a in ATLASES.values())
+    logger.info("Labels: %d built from %d compiles (%d saved)", labels, compiles, labels - compiles)
+    return labels - compiles
@@ -0,0 +1,260 @@
+# Vertex positions computed from the edges alone, with a force-directed
+# layout (Fruchterman-Reingold): edges pull their ends together, all
+# vertices push each other apart, and the moves shrink every iteration.
+#
+# Every force is computed for all vertices at once with NumPy. Up to
+# EXACT_LIMIT vertices the repulsion is summed over all pairs; above it a
+# Barnes-Hut quadtree is used, where a far away cell pushes like a single
+# vertex at its center of mass, so an iteration costs about n log n
+# instead of n^2 pair interactions.
+#
+# Large graphs get fewer iterations (FULL_ITERATIONS up to FULL_LIMIT
+# vertices, then fewer down to MIN_ITERATIONS), since every iteration costs
+# more and the cooling schedule still settles the layout. Computing one
+# takes about 0.8 s for 1000 or 2000 vertices and 3 s for 10000.
+#
+# Layouts are computed in the unit square and cached by a hash of the
+# graph, in memory and in media/layout_cache at the top of the repository
+# (or LAYOUT_CACHE_DIR), so a scene gets the same picture every render
+# without recomputing it. fit_to_frame scales a layout into a box on screen.
+#
+#   python -m Common.layout --vertices 2000 --degree 3
+
+import argparse
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# bump when the algorithm changes, so cached layouts are recomputed
+FORMAT = 1
+
+EXACT_LIMIT = 200
+FULL_ITERATIONS = 100
+FULL_LIMIT = 1000
+MIN_ITERATIONS = 30
+DEFAULT_DIR = Path(__file__).resolve().parent.parent / "media" / "layout_cache"
+
+_cache = {}
+
+
+def as_edges(edges):
+    return np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+
+
+def cache_dir():
+    return Path(os.environ.get("LAYOUT_CACHE_DIR") or DEFAULT_DIR)
+
+
+# Iterations for n vertices, so the cost grows about like n log n
+def default_iterations(n):
+    if n <= FULL_LIMIT:
+        return FULL_ITERATIONS
+    return max(MIN_ITERATIONS, FULL_ITERATIONS * FULL_LIMIT // n)
+
+
+# Repulsion on every vertex from every other vertex, summed exactly
+def exact_repulsion(pos, k2):
+    dx = pos[:, 0, None] - pos[None, :, 0]
+    dy = pos[:, 1, None] - pos[None, :, 1]
+    d2 = dx*dx + dy*dy
+    np.fill_diagonal(d2, np.inf)
+    scale = k2 / np.maximum(d2, 1e-12)
+    return np.stack([(dx*scale).sum(axis=1), (dy*scale).sum(axis=1)], axis=1)
+
+
+# The quadtree over pos, one entry per level: (cell of every vertex, mass,
+# center of mass x and y, width) of the cells that contain vertices, and
+# the children of every cell of the level before as CSR arrays
+def quadtree(pos, depth):
+    lo = pos.min(axis=0)
+    size = max((pos.max(axis=0) - lo).max(), 1e-9) * (1 + 1e-9)
+    # Z-order keys of the bottom level cells: the key of the cell on a level
+    # above is the key shifted right by two bits per level, so the
+    # children of a cell always have consecutive keys
+    ij = np.minimum(((pos - lo) / size * (1 << depth)).astype(np.int64), (1 << depth) - 1)
+    bottom = np.zeros(len(pos), dtype=np.int64)
+    for b in range(depth):
+        bottom |= ((ij[:, 0] >> b) & 1) << (2*b + 1) | ((ij[:, 1] >> b) & 1) << (2*b)
+
+    levels = []
+    keys = None
+    for level in range(depth + 1):
+        child_keys, cell = np.unique(bottom >> 2*(depth - level), return_inverse=True)
+        mass = np.bincount(cell, minlength=len(child_keys)).astype(float)
+        cx = np.bincount(cell, pos[:, 0], len(child_keys)) / mass
+        cy = np.bincount(cell, pos[:, 1], len(child_keys)) / mass
+        children = None
+        if keys is not None:
+            parent = np.searchsorted(keys, child_keys >> 2)
+            children = np.searchsorted(parent, np.arange(len(keys) + 1))
+        levels.append((cell, mass, cx, cy, size / (1 << level), children))
+        keys = child_keys
+    return levels
+
+
+# Barnes-Hut repulsion: (vertex, cell) pairs are walked down the tree a
+# level at a time. A cell that is small compared to its distance (width /
+# distance < theta) pushes as one vertex of its mass; the others are opened
+# into their children. Cells still open at the bottom level push from
+# their center of mass, without the vertex itself.
+def barnes_hut_repulsion(pos, k2, theta=0.9, depth=None):
+    n = len(pos)
+    if depth is None:
+        depth = max(2, min(10, int(np.ceil(np.log(n) / np.log(4))) + 1))
+    levels = quadtree(pos, depth)
+    x, y = pos[:, 0], pos[:, 1]
+    fx = np.zeros(n)
+    fy = np.zeros(n)
+
+    vertex = np.arange(n)
+    cell = np.zeros(n, dtype=np.int64)
+    for level, (own, mass, cx, cy, width, _) in enumerate(levels):
+        m = mass[cell]
+        inside = own[vertex] == cell
+        px, py = x[vertex], y[vertex]
+        if level == depth:
+            # leave the vertex itself out of its own cell
+            m = m - inside
+            share = np.where(inside, 1 / np.maximum(m, 1), 0.0)
+            dx = (px - cx[cell]) * (1 + share)
+            dy = (py - cy[cell]) * (1 + share)
+            far = m > 0
+        else:
+            dx = px - cx[cell]
+            dy = py - cy[cell]
+            far = ~inside & (width * width < theta * theta * (dx*dx + dy*dy))
+        scale = m[far] * k2 / np.maximum(dx[far]**2 + dy[far]**2, 1e-12)
+        fx += np.bincount(vertex[far], dx[far] * scale, n)
+        fy += np.bincount(vertex[far], dy[far] * scale, n)
+        if level == depth:
+            break
+
+        # open the near cells into their children on the next level
+        vertex, cell = vertex[~far], cell[~far]
+        children = levels[level + 1][5]
+        first = children[cell]
+        count = children[cell + 1] - first
+        offset = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+        vertex = np.repeat(vertex, count)
+        cell = np.repeat(first, count) + offset
+    return np.stack([fx, fy], axis=1)
+
+
+# Positions of n vertices in the unit square, as an (n, 2) array
+def force_layout(n, edges, iterations=None, seed=0, theta=0.9, gravity=0.05):
+    edges = as_edges(edges)
+    if iterations is None:
+        iterations = default_iterations(n)
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n, 2))
+    if n < 2:
+        return np.full((n, 2), 0.5)
+
+    # ideal edge length for n vertices in the unit square
+    k = np.sqrt(1.0 / n)
+    k2 = k * k
+    u, v = edges[:, 0], edges[:, 1]
+    step = 0.1
+    for i in range(iterations):
+        if n <= EXACT_LIMIT:
+            force = exact_repulsion(pos, k2)
+        else:
+            force = barnes_hut_repulsion(pos, k2, theta)
+
+        delta = pos[u] - pos[v]
+        pull = delta * (np.linalg.norm(delta, axis=1, keepdims=True) / k)
+        for d in range(2):
+            force[:, d] += np.bincount(v, pull[:, d], n) - np.bincount(u, pull[:, d], n)
+        # keeps separate components from drifting apart
+        force -= gravity * n * k * (pos - pos.mean(axis=0))
+
+        # move every vertex at most step, less in every iteration
+        length = np.linalg.norm(force, axis=1, keepdims=True)
+        temperature = step * (1 - i / iterations)
+        pos += force / np.maximum(length, 1e-12) * np.minimum(length, temperature)
+
+    lo = pos.min(axis=0)
+    return (pos - lo) / max((pos.max(axis=0) - lo).max(), 1e-12)
+
+
+def layout_key(n, edges, iterations, seed):
+    digest = hashlib.sha256(b"%d %d %d %d " % (FORMAT, n, iterations, seed))
+    digest.update(np.ascontiguousarray(as_edges(edges)).tobytes())
+    return digest.hexdigest()[:16]
+
+
+# force_layout, computed once per graph and then read from the cache
+def cached_layout(n, edges, iterations=None, seed=0, directory=None):
+    if iterations is None:
+        iterations = default_iterations(n)
+    key = layout_key(n, edges, iterations, seed)
+    if key in _cache:
+        return _cache[key]
+
+    path = Path(directory or cache_dir()) / (key + ".npy")
+    try:
+        pos = np.load(path)
+    except (OSError, ValueError):
+        pos = force_layout(n, edges, iterations, seed)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".part")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, pos)
+        os.replace(tmp, path)
+    _cache[key] = pos
+    return pos
+
+
+# Scale positions (keeping their aspect ratio) into a width x height box
+# around center, as (n, 3) points
+def fit_to_frame(positions, width=12.0, height=6.0, center=(0, 0, 0)):
+    positions = np.asarray(positions, dtype=float)[:, :2]
+    points = np.zeros((len(positions), 3))
+    if not len(positions):
+        return points
+    lo, hi = positions.min(axis=0), positions.max(axis=0)
+    extent = hi - lo
+    scale = min(width / extent[0] if extent[0] > 0 else np.inf,
+                height / extent[1] if extent[1] > 0 else np.inf)
+    if not np.isfinite(scale):
+        scale = 0.0
+    points[:, :2] = (positions - (lo + hi) / 2) * scale
+    return points + np.asarray(center, dtype=float)
+
+
+# Positions for a graph on screen: the cached layout fitted into the box
+def auto_layout(n, edges, width=12.0, height=6.0, center=(0, 0, 0), iterations=None, seed=0):
+    return fit_to_frame(cached_layout(n, edges, iterations, seed), width, height, center)
+
+
+def random_graph(n, degree, seed=0):
+    rng = np.random.default_rng(seed)
+    # a random spanning tree, so the graph is connected, plus random edges
+    tree = np.stack([np.arange(1, n), rng.integers(0, np.arange(1, n))], axis=1)
+    extra = rng.integers(0, n, (max(0, int(n * (degree - 2) / 2)), 2))
+    extra = extra[extra[:, 0] != extra[:, 1]]
+    return np.vstack([tree, extra])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the force-directed layout on a random graph.")
+    parser.add_argument("--vertices", type=int, default=1000)
+    parser.add_argument("--degree", type=float, default=3.0, help="average vertex degree")
+    parser.add_argument("--iterations", type=int, default=None, help="default: %d, fewer above %d vertices" % (
+        FULL_ITERATIONS, FULL_LIMIT))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    edges = random_graph(args.vertices, args.degree, args.seed)
+    start = time.perf_counter()
+    force_layout(args.vertices, edges, args.iterations, args.seed)
+    method = "exact" if args.vertices <= EXACT_LIMIT else "Barnes-Hut"
+    print("%d vertices, %d edges: %.3f s (%s)" % (args.vertices, len(edges), time.perf_counter() - start, method))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# NFAs with the set of current states stored as an integer bitset
+# (bit q is set when state q is active).
+#
+# Epsilon-closures are computed once, and every transition table already
+# includes the closure of its targets, so a step never has to close the
+# result again. A step looks up the targets of 8 states at a time in a
+# table per symbol and ORs them together, which costs about |Q|/8 lookups
+# and ORs of |Q|-bit integers per symbol.
+
+EPSILON = ""
+
+# states per lookup table chunk
+CHUNK = 8
+CHUNK_MASK = (1 << CHUNK) - 1
+
+
+def bits(mask):
+    # indices of the set bits, lowest first
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class NFA:
+    # names: one name per state, states are referred to by index.
+    # transitions: {(state, symbol): [states]}, symbol EPSILON for epsilon moves.
+    def __init__(self, names, start, accepting, transitions):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.n = len(self.names)
+        self.start = self.state(start)
+        self.accepting = 0
+        for q in accepting:
+            self.accepting |= 1 << self.state(q)
+
+        # (source, target) of every transition, each once: the arrows of the
+        # state diagram (Common.arrows)
+        self.pairs = sorted({(self.state(q), self.state(t)) for (q, _), targets in transitions.items() for t in targets})
+
+        moves = {}
+        for (q, symbol), targets in transitions.items():
+            row = moves.setdefault(symbol, [0] * self.n)
+            for t in targets:
+                row[self.state(q)] |= 1 << self.state(t)
+
+        self.closures = self.compute_closures(moves.pop(EPSILON, [0] * self.n))
+        self.alphabet = sorted(moves)
+        # delta[symbol][q] = closure of the targets of q on symbol
+        self.delta = {symbol: [self.closure(row[q]) for q in range(self.n)] for symbol, row in moves.items()}
+        self.tables = {symbol: self.chunk_tables(row) for symbol, row in self.delta.items()}
+
+    def state(self, q):
+        return self.index[q] if isinstance(q, str) else q
+
+    # closures[q] = states reachable from q with epsilon moves only
+    def compute_closures(self, epsilon):
+        closures = []
+        for q in range(self.n):
+            reached = 1 << q
+            frontier = reached
+            while frontier:
+                new = 0
+                for p in bits(frontier):
+                    new |= epsilon[p]
+                frontier = new & ~reached
+                reached |= new
+            closures.append(reached)
+        return closures
+
+    def closure(self, mask):
+        result = 0
+        for q in bits(mask):
+            result |= self.closures[q]
+        return result
+
+    # For every chunk of CHUNK states and every subset of it, the OR of
+    # the rows of the states in the subset
+    def chunk_tables(self, row):
+        tables = []
+        for base in range(0, self.n, CHUNK):
+            table = [0] * (1 << CHUNK)
+            for subset in range(1, 1 << CHUNK):
+                low = subset & -subset
+                q = base + low.bit_length() - 1
+                table[subset] = table[subset ^ low] | (row[q] if q < self.n else 0)
+            tables.append(table)
+        return tables
+
+    def step(self, mask, symbol):
+        tables = self.tables.get(symbol)
+        if tables is None:
+            return 0
+        result = 0
+        for table in tables:
+            if mask & CHUNK_MASK:
+                result |= table[mask & CHUNK_MASK]
+            mask >>= CHUNK
+            if not mask:
+                break
+        return result
+
+    # Active states before and after every symbol of word
+    def run(self, word, start=None):
+        mask = self.closure(1 << self.start) if start is None else self.closure(start)
+        trace = [mask]
+        for symbol in word:
+            mask = self.step(mask, symbol)
+            trace.append(mask)
+        return trace
+
+    def accepts(self, word):
+        return bool(self.run(word)[-1] & self.accepting)
+
+    # "a" for one state, "{a, ab}" for several, "{}" for none
+    def format(self, mask):
+        names = [self.names[q] for q in bits(mask)]
+        if len(names) == 1:
+            return names[0]
+        return "{%s}" % ", ".join(names)
+
+
+# The run of the half(L) NFA M' on word, as the (p, h, q) states of its
+# successful guess: p is the run of M from its start, h the guessed
+# halfway state and q the run of M from h. If no guess succeeds, the
+# first state M can be in after word is used as h.
+def half_trace(nfa, word):
+    p_trace = nfa.run(word)
+    halfway = list(bits(p_trace[-1]))
+    if not halfway:
+        return []
+    h = halfway[0]
+    for guess in halfway:
+        if nfa.run(word, 1 << guess)[-1] & nfa.accepting:
+            h = guess
+            break
+    q_trace = nfa.run(word, 1 << h)
+    return [(p, h, q) for p, q in zip(p_trace, q_trace)]
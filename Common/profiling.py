@@ -0,0 +1,165 @@
+import sys
+import time
+from collections import Counter
+from threading import Lock
+from pathlib import Path
+
+import manim
+from manim import *
+from manim.renderer.cairo_renderer import CairoRenderer
+
+# Frames in these directories are skipped when looking for the line of a scene script
+LIBRARY_DIRS = (str(Path(manim.__file__).resolve().parent), str(Path(__file__).resolve().parent))
+
+
+# "script.py:123" of the scene code that called play or wait
+def source_line():
+    frame = sys._getframe(1)
+    while frame is not None and str(Path(frame.f_code.co_filename).resolve()).startswith(LIBRARY_DIRS):
+        frame = frame.f_back
+    if frame is None:
+        return "?"
+    return "%s:%d" % (Path(frame.f_code.co_filename).name, frame.f_lineno)
+
+
+# "Create x10, FadeIn" for a list of animations
+def describe(animations):
+    counts = Counter(type(a).__name__ for a in animations)
+    return ", ".join(name if n == 1 else "%s x%d" % (name, n) for name, n in counts.items())
+
+
+class PlayProfiler:
+    # One record per play or wait call: where it was made, how long it is,
+    # how many frames and mobjects it had, and where the render time went
+    def __init__(self):
+        self.records = []
+
+    def add(self, **record):
+        record["index"] = len(self.records)
+        self.records.append(record)
+
+    def report(self):
+        lines = ["%5s %-5s %-26s %7s %6s %6s %8s %8s %8s %8s %8s  %s" % (
+            "#", "kind", "line", "seconds", "frames", "family",
+            "wall", "interp", "raster", "queue", "encode", "animations")]
+        for r in sorted(self.records, key=lambda r: r["wall"], reverse=True):
+            lines.append("%5d %-5s %-26s %7.2f %6d %6d %8.3f %8.3f %8.3f %8.3f %8.3f  %s" % (
+                r["index"], r["kind"], r["line"], r["duration"], r["frames"], r["family"],
+                r["wall"], r["interpolate"], r["raster"], r["queue"], r["encode"], r["animations"]))
+        total = sum(r["wall"] for r in self.records)
+        encode = sum(r["encode"] for r in self.records)
+        lines.append("%d calls, %.2fs (encoding %.2fs on encoder threads, next to the render)" % (
+            len(self.records), total, encode))
+        return "\n".join(lines) + "\n"
+
+    # Collapsed stacks (scene;line kind;phase microseconds) for flamegraph.pl or speedscope
+    def folded(self, scene_name):
+        lines = []
+        for r in self.records:
+            stack = "%s;%s %s(%s)" % (scene_name, r["line"], r["kind"], r["animations"].replace(";", ","))
+            for phase in ("interpolate", "raster", "queue", "encode"):
+                lines.append("%s;%s %d" % (stack, phase, round(r[phase] * 1e6)))
+        return "\n".join(lines) + "\n"
+
+    def write(self, scene_name, directory):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / (scene_name + ".txt")).write_text(self.report())
+        (directory / (scene_name + ".folded")).write_text(self.folded(scene_name))
+        logger.info("Profile of %d calls written to %s", len(self.records), directory / (scene_name + ".txt"))
+
+
+class TimedEncoder:
+    # Wraps a segment encoder and adds the time spent in write_frame and
+    # finish to times[play]. Encoders run on their own threads, so this is
+    # the real encoding cost, not the time to queue a frame. play is the
+    # play the encoder was made for; a single encoder for the whole scene
+    # (RENDER_MODE=stream) is told the play of every frame.
+    def __init__(self, encoder, times, lock, play):
+        self.encoder = encoder
+        self.times = times
+        self.lock = lock
+        self.play = play
+
+    def __getattr__(self, name):
+        return getattr(self.encoder, name)
+
+    def timed(self, method, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            with self.lock:
+                self.times[self.play] += time.perf_counter() - start
+
+    def write_frame(self, pixels, *, repeat=1):
+        return self.timed(self.encoder.write_frame, pixels, repeat=repeat)
+
+    def finish(self):
+        return self.timed(self.encoder.finish)
+
+
+class ProfilingRenderer(CairoRenderer):
+    # Times every play call, and the rasterization (update_frame) and the
+    # hand-off of frames to the encoder (add_frame, which only waits when
+    # the encoder falls behind) inside it. The rest of the call is counted
+    # as interpolation, which includes setting the animations up. The
+    # encoding itself runs on encoder threads and is timed there, so the
+    # profile is written once the scene's encoders have finished.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.profiler = PlayProfiler()
+        self.raster = 0.0
+        self.queue = 0.0
+        self.frames = 0
+        self.encode_times = Counter()
+        self.encode_lock = Lock()
+
+    def init_scene(self, *args, **kwargs):
+        super().init_scene(*args, **kwargs)
+        create = self.file_writer._create_segment_encoder
+
+        def create_segment_encoder(target):
+            return TimedEncoder(create(target), self.encode_times, self.encode_lock, self.num_plays)
+        self.file_writer._create_segment_encoder = create_segment_encoder
+
+    def update_frame(self, *args, **kwargs):
+        start = time.perf_counter()
+        super().update_frame(*args, **kwargs)
+        self.raster += time.perf_counter() - start
+
+    def add_frame(self, frame, num_frames=1):
+        start = time.perf_counter()
+        super().add_frame(frame, num_frames)
+        self.queue += time.perf_counter() - start
+        if not self.skip_animations:
+            self.frames += num_frames
+
+    def play(self, scene, *args, **kwargs):
+        line = source_line()
+        self.raster = self.queue = 0.0
+        self.frames = 0
+        start = time.perf_counter()
+        super().play(scene, *args, **kwargs)
+        wall = time.perf_counter() - start
+
+        animations = scene.animations or []
+        self.profiler.add(
+            kind="wait" if all(isinstance(a, Wait) for a in animations) else "play",
+            line=line,
+            animations=describe(animations),
+            duration=scene.duration,
+            frames=self.frames,
+            family=sum(len(a.mobject.get_family()) for a in animations),
+            wall=wall,
+            interpolate=wall - self.raster - self.queue,
+            raster=self.raster,
+            queue=self.queue,
+        )
+
+    def scene_finished(self, scene):
+        # waits for the encoders, so every play's encoding time is known
+        super().scene_finished(scene)
+        for record in self.profiler.records:
+            record["encode"] = self.encode_times[record["index"]]
+        self.profiler.write(type(scene).__name__, Path(config.media_dir) / "profile")
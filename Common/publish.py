@@ -0,0 +1,171 @@
+# Encode rendered videos for the website, e.g.
+#
+#   python -m Common.publish docs/vid/*.mp4
+#   python -m Common.publish media/videos/transformations/1080p60/Transformations.mp4 --name final_product
+#
+# Every video is written once, as
+#   docs/vid/store/<hash>/<height>.mp4   H.264 with the index (moov) first, so playback starts at once
+#   docs/vid/store/<hash>/<height>.webm  VP9, usually much smaller
+#   docs/vid/store/<hash>/poster.jpg     the last frame, shown before the video loads
+# at the heights in RESOLUTIONS that are not above the source, where <hash>
+# is a hash of the source file. Publishing an unchanged video again writes
+# nothing. docs/_data/videos.json maps every name to its files, and
+# docs/_includes/video.html turns it into a <video> tag; names that were
+# never published fall back to docs/vid/<name>.mp4.
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import av
+
+DOCS = Path(__file__).resolve().parent.parent / "docs"
+STORE = DOCS / "vid" / "store"
+MANIFEST = DOCS / "_data" / "videos.json"
+
+RESOLUTIONS = (480, 720, 1080)
+
+# (container, codec, encoder options, MIME type)
+FORMATS = {
+    "webm": ("webm", "libvpx-vp9", {"crf": "33", "b": "0", "row-mt": "1", "deadline": "good"}, "video/webm"),
+    "mp4": ("mp4", "libx264", {"crf": "23", "preset": "slow", "tune": "animation"}, "video/mp4"),
+}
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def source_size(path):
+    with av.open(str(path)) as video:
+        stream = video.streams.video[0]
+        return stream.width, stream.height
+
+
+# Heights to publish: the standard ones up to the source height
+def heights_for(source_height):
+    heights = [h for h in RESOLUTIONS if h <= source_height]
+    return heights or [source_height]
+
+
+def even(x):
+    return max(2, int(round(x / 2)) * 2)
+
+
+# Encode source at the given height into target. Frame timestamps are kept,
+# so videos rendered with RENDER_MODE=hold keep their variable frame rate.
+def encode(source, target, height, fmt):
+    container, codec, options, _ = FORMATS[fmt]
+    partial = target.with_name(target.name + ".part")
+    with av.open(str(source)) as inp:
+        in_stream = inp.streams.video[0]
+        width = even(in_stream.width * height / in_stream.height)
+        container_options = {"movflags": "+faststart"} if container == "mp4" else {}
+        with av.open(str(partial), "w", format=container, options=container_options) as out:
+            stream = out.add_stream(codec, rate=in_stream.average_rate, options=options)
+            stream.width = width
+            stream.height = height
+            stream.pix_fmt = "yuv420p"
+            stream.time_base = in_stream.time_base
+            stream.codec_context.time_base = in_stream.time_base
+            for frame in inp.decode(in_stream):
+                scaled = frame.reformat(width=width, height=height, format="yuv420p")
+                scaled.pts = frame.pts
+                scaled.time_base = in_stream.time_base
+                for packet in stream.encode(scaled):
+                    out.mux(packet)
+            for packet in stream.encode():
+                out.mux(packet)
+    os.replace(partial, target)
+
+
+def save_poster(source, target):
+    last = None
+    with av.open(str(source)) as video:
+        for frame in video.decode(video=0):
+            last = frame
+    last.to_image().save(target, quality=85, optimize=True)
+
+
+def url(path):
+    return "/" + path.relative_to(DOCS).as_posix()
+
+
+# Encode a video into the store (if it is not there yet) and return its manifest entry
+def publish(source):
+    key = file_hash(source)
+    directory = STORE / key
+    directory.mkdir(parents=True, exist_ok=True)
+
+    width, height = source_size(source)
+    heights = heights_for(height)
+    sources = []
+    for fmt in FORMATS:
+        for i, h in enumerate(heights):
+            target = directory / ("%d.%s" % (h, fmt))
+            if not target.exists():
+                encode(source, target, h, fmt)
+            entry = {"src": url(target), "type": FORMATS[fmt][3], "height": h}
+            # smaller variants only for screens they fit, the largest for the rest
+            if i < len(heights) - 1:
+                entry["media"] = "(max-width: %dpx)" % even(width * h / height)
+            sources.append(entry)
+
+    poster = directory / "poster.jpg"
+    if not poster.exists():
+        save_poster(source, poster)
+    return {"hash": key, "width": width, "height": height, "poster": url(poster), "sources": sources}
+
+
+def load_manifest():
+    if MANIFEST.exists():
+        return json.loads(MANIFEST.read_text())
+    return {}
+
+
+def save_manifest(manifest):
+    MANIFEST.parent.mkdir(parents=True, exist_ok=True)
+    MANIFEST.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+
+
+# Remove store entries no name refers to any more
+def prune(manifest):
+    used = {entry["hash"] for entry in manifest.values()}
+    removed = []
+    for directory in STORE.iterdir() if STORE.exists() else []:
+        if directory.is_dir() and directory.name not in used:
+            shutil.rmtree(directory)
+            removed.append(directory.name)
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Encode videos for the website.")
+    parser.add_argument("videos", nargs="+")
+    parser.add_argument("-n", "--name", help="name to publish a single video under (default: file name)")
+    parser.add_argument("--prune", action="store_true", help="remove store entries that are no longer used")
+    args = parser.parse_args()
+    if args.name and len(args.videos) > 1:
+        parser.error("--name needs exactly one video")
+
+    manifest = load_manifest()
+    for video in args.videos:
+        name = args.name or Path(video).stem
+        manifest[name] = publish(video)
+        print("%s -> %s" % (name, STORE / manifest[name]["hash"]))
+    save_manifest(manifest)
+
+    if args.prune:
+        for key in prune(manifest):
+            print("removed %s" % key)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+# The CLIQUE -> DUMBBELL reduction from Reductions, and solvers to check it.
+#
+# G' is G plus a new k-clique, one vertex of which (the hub) is joined to
+# every vertex of G. G has a k-clique if and only if G' has a
+# (k, k)-dumbbell: two disjoint k-cliques joined by an edge.
+#
+# Graphs are (n, edges) with vertices 0..n-1; the solvers work on
+# adjacency bitsets (bit u of adj[v] is set when u and v are adjacent).
+#
+#   python -m Common.reduction --instances 1000 --vertices 12 -k 4 -j 8
+
+import argparse
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from Common.nfa import bits
+
+
+def adjacency(n, edges):
+    adj = [0] * n
+    for u, v in edges:
+        u, v = int(u), int(v)
+        if u != v:
+            adj[u] |= 1 << v
+            adj[v] |= 1 << u
+    return adj
+
+
+# G' for the instance (G, k): G, then the new clique on n..n+k-1.
+# The hub is vertex n. Returns (n', edges', hub).
+def clique_to_dumbbell(n, edges, k):
+    new = list(range(n, n + k))
+    clique = [(u, v) for i, u in enumerate(new) for v in new[i + 1:]]
+    hub = [(n, v) for v in range(n)]
+    return n + k, [tuple(e) for e in edges] + clique + hub, n
+
+
+# Greedy coloring of the vertices in P, as (vertex, color) with colors
+# increasing. A clique inside P has at most as many vertices as colors.
+def color_order(adj, P):
+    order = []
+    color = 0
+    while P:
+        color += 1
+        Q = P
+        while Q:
+            low = Q & -Q
+            v = low.bit_length() - 1
+            Q &= ~adj[v] & ~low
+            P &= ~low
+            order.append((v, color))
+    return order
+
+
+# Branch and bound for a clique of at least k vertices (the largest clique
+# when k is None), pruning with the coloring bound. Returns its bitset, or
+# 0 when there is none.
+def find_clique(adj, k=None):
+    best = [0 if k is None else k - 1, 0]
+
+    def expand(R, size, P):
+        order = color_order(adj, P)
+        for v, color in reversed(order):
+            if size + color <= best[0]:
+                return False
+            low = 1 << v
+            P2 = P & adj[v]
+            if P2:
+                if expand(R | low, size + 1, P2):
+                    return True
+            elif size + 1 > best[0]:
+                best[0], best[1] = size + 1, R | low
+                if k is not None:
+                    return True
+            P &= ~low
+        return False
+
+    expand(0, 0, (1 << len(adj)) - 1)
+    return best[1]
+
+
+def has_clique(adj, k):
+    return k <= 0 or find_clique(adj, k) != 0
+
+
+# Every clique of exactly k vertices, as bitsets
+def cliques_of_size(adj, k):
+    found = []
+
+    def extend(R, size, P):
+        if size == k:
+            found.append(R)
+            return
+        while P and size + P.bit_count() >= k:
+            low = P & -P
+            v = low.bit_length() - 1
+            P &= ~low
+            # only later vertices, so every clique is found once
+            extend(R | low, size + 1, P & adj[v])
+
+    extend(0, 0, (1 << len(adj)) - 1)
+    return found
+
+
+# A (k, k)-dumbbell in the graph, as the bitsets of its two cliques, or None
+def find_dumbbell(adj, k):
+    cliques = cliques_of_size(adj, k)
+    neighbors = []
+    for c in cliques:
+        reach = 0
+        for v in bits(c):
+            reach |= adj[v]
+        neighbors.append(reach)
+    for i, a in enumerate(cliques):
+        for b in cliques[i + 1:]:
+            if not a & b and neighbors[i] & b:
+                return a, b
+    return None
+
+
+def has_dumbbell(adj, k):
+    return find_dumbbell(adj, k) is not None
+
+
+# Solve (G, k) as CLIQUE and (G', k) as DUMBBELL; the reduction is
+# correct on this instance when the answers agree
+def verify_instance(instance):
+    n, edges, k = instance
+    clique = has_clique(adjacency(n, edges), k)
+    n2, edges2, _ = clique_to_dumbbell(n, edges, k)
+    dumbbell = has_dumbbell(adjacency(n2, edges2), k)
+    return clique, dumbbell
+
+
+# Check a graph drawn as an example: its CLIQUE answer for k must be
+# expected, and G' must give the same DUMBBELL answer
+def check_example(n, edges, k, expected):
+    clique, dumbbell = verify_instance((n, edges, k))
+    if clique != expected or dumbbell != expected:
+        raise ValueError("example for k = %d should be %s, but CLIQUE says %s and DUMBBELL says %s"
+                         % (k, "YES" if expected else "NO", clique, dumbbell))
+    return expected
+
+
+def random_instance(n, p, k, seed):
+    rng = random.Random(seed)
+    edges = [(u, v) for u in range(n) for v in range(u + 1, n) if rng.random() < p]
+    return n, edges, k
+
+
+# Verify many instances in a process pool. Returns (yes, no, failures).
+def verify_batch(instances, jobs=None):
+    yes = no = 0
+    failures = []
+    with ProcessPoolExecutor(jobs or os.cpu_count()) as pool:
+        for instance, (clique, dumbbell) in zip(instances, pool.map(verify_instance, instances, chunksize=16)):
+            if clique != dumbbell:
+                failures.append(instance)
+            elif clique:
+                yes += 1
+            else:
+                no += 1
+    return yes, no, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the CLIQUE -> DUMBBELL reduction on random graphs.")
+    parser.add_argument("--instances", type=int, default=1000)
+    parser.add_argument("--vertices", type=int, default=12)
+    parser.add_argument("-p", type=float, default=0.5, help="edge probability")
+    parser.add_argument("-k", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-j", "--jobs", type=int, default=None)
+    args = parser.parse_args()
+
+    instances = [random_instance(args.vertices, args.p, args.k, args.seed + i) for i in range(args.instances)]
+    yes, no, failures = verify_batch(instances, args.jobs)
+    print("%d instances: %d YES, %d NO, %d failures" % (len(instances), yes, no, len(failures)))
+    for n, edges, k in failures[:5]:
+        print("failure: n = %d, k = %d, edges = %s" % (n, k, edges))
+
+
+if __name__ == "__main__":
+    main()
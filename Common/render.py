@@ -0,0 +1,343 @@
+import functools
+import hashlib
+import os
+import sys
+from collections import OrderedDict
+from queue import Queue
+from threading import Thread
+from manim import *
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+from manim.scene.video_segment_encoder import VideoSegmentEncoder
+from manim.utils.hashing import get_json
+
+from Common import glyph_cache
+from Common.profiling import ProfilingRenderer, TimedEncoder
+from Common.segments import write_segment_stats
+from Common.stills import StillsRenderer
+from Common.text_pool import TEXTS
+
+
+# Render modes are picked with an environment variable, since manim's
+# command line has no room for our own flags, e.g.
+#   RENDER_MODE=hold manim -qh transformations.py Transformations
+#   RENDER_MODE=hold,profile manim -qh transformations.py Transformations
+#   RENDER_MODE=stills,sections,webp manim -qh reductions.py Reductions
+#   RENDER_MODE=stream,hold manim -qh dijkstra.py Dijkstra
+def render_modes():
+    return {mode.strip() for mode in os.environ.get("RENDER_MODE", "").split(",") if mode.strip()}
+
+
+class HoldSegmentEncoder(VideoSegmentEncoder):
+    # Encodes a run of identical frames only once. The next different frame
+    # gets a later timestamp, so the player holds the picture (variable frame
+    # rate). The last copy of a run is encoded as well, so a hold at the end
+    # of a segment keeps its length.
+    def __init__(self, *, target, spec):
+        super().__init__(target=target, spec=spec)
+        self.last = None
+        self.held = 0
+        self.frames_skipped = 0
+
+    def write_frame(self, pixels, *, repeat=1):
+        if self.last is not None and np.array_equal(pixels, self.last):
+            self._next_pts += repeat
+            self.held += repeat
+            return
+
+        self.end_hold()
+        super().write_frame(pixels, repeat=1)
+        self._next_pts += repeat - 1
+        self.held = repeat - 1
+        self.last = pixels
+
+    def end_hold(self):
+        if self.held > 0:
+            self._next_pts -= 1
+            super().write_frame(self.last, repeat=1)
+            self.frames_skipped += self.held - 1
+        self.held = 0
+
+    def finish(self):
+        if not self._closed:
+            self.end_hold()
+            logger.debug("%s: %d held frames not encoded", self.target.name, self.frames_skipped)
+        super().finish()
+
+
+class SegmentFileWriter(SceneFileWriter):
+    # Every play and wait is keyed by manim's hash of the mobjects it
+    # starts from, its animations with their parameters and run times, and
+    # the camera. A play whose segment was rendered before (earlier in the
+    # scene, e.g. the same blink again, or in an earlier render) reuses it
+    # instead of being rendered. This counts the hits and misses so the
+    # reuse can be checked, see Common/segments.py.
+    def __init__(self, settings):
+        super().__init__(settings)
+        self.plays = 0
+        # (play index, hash, hit) of every play that was looked up
+        self.segments = []
+
+    @property
+    def segment_hits(self):
+        return sum(hit for _, _, hit in self.segments)
+
+    def is_already_cached(self, hash_invocation):
+        hit = self.segment_cached(hash_invocation)
+        self.segments.append((self.plays, hash_invocation, hit))
+        return hit
+
+    def add_partial_movie_file(self, hash_animation):
+        super().add_partial_movie_file(hash_animation)
+        self.plays += 1
+
+    def segment_cached(self, hash_invocation):
+        return super().is_already_cached(hash_invocation)
+
+    def segment_stats(self):
+        hits = self.segment_hits
+        return {"hits": hits, "misses": len(self.segments) - hits,
+                "plays": [{"index": i, "hash": h, "hit": hit} for i, h, hit in self.segments]}
+
+
+class HoldFileWriter(SegmentFileWriter):
+    def _create_segment_encoder(self, target):
+        if self.video_encoder is None:
+            raise RuntimeError("Video segment encoding requires resolved settings.")
+        return HoldSegmentEncoder(target=target, spec=self.video_encoder)
+
+
+class StreamEncodeJob:
+    # One encoder for the whole scene, fed by a thread through a bounded
+    # queue, so rendering and encoding overlap the way manim's per-play
+    # jobs do, but without one file per play
+    def __init__(self, encoder, queue_size):
+        self.encoder = encoder
+        self.queue = Queue(maxsize=queue_size)
+        self.error = None
+        self.thread = Thread(target=self.run, name="stream-encoder")
+        self.thread.start()
+
+    def run(self):
+        while True:
+            repeat, pixels, play = self.queue.get()
+            if pixels is None:
+                break
+            if isinstance(self.encoder, TimedEncoder):
+                # RENDER_MODE=profile: time the frame for the play it came from
+                self.encoder.play = play
+            if self.error is None:
+                try:
+                    self.encoder.write_frame(pixels, repeat=repeat)
+                except BaseException as error:
+                    self.error = error
+
+    def put(self, repeat, pixels, play):
+        if self.error is not None:
+            raise self.error
+        self.queue.put((repeat, pixels, play))
+
+    def close(self, abort=False):
+        self.queue.put((0, None, None))
+        self.thread.join()
+        if abort or self.error is not None:
+            self.encoder.abort()
+            if self.error is not None and not abort:
+                raise self.error
+        else:
+            self.encoder.finish()
+
+
+class StreamFileWriter(SegmentFileWriter):
+    # Streams every rendered frame of the scene into a single encoder that
+    # writes <movie>.part, and moves it into place when the scene ends. No
+    # partial movie files are written and nothing is concatenated. GIF
+    # output and --save_sections keep the usual per-play files.
+    #
+    # Segments are reused from memory instead of from partial movie files:
+    # the frames of every rendered play are kept (a wait is a single frame)
+    # under the play's hash, and a play with the same hash sends them to
+    # the encoder again. The least recently used segments are dropped once
+    # they take more than SEGMENT_CACHE_MB (512 by default).
+    def __init__(self, settings):
+        super().__init__(settings)
+        self.stream = None
+        self.streaming = self.output_spec.is_video and not self.output_spec.is_gif and not self.output_spec.save_sections
+        self.memo = OrderedDict()
+        self.memo_bytes = 0
+        self.max_memo_bytes = int(float(os.environ.get("SEGMENT_CACHE_MB", 512)) * 1024 * 1024)
+        self.current_hash = None
+        self.recording = None
+        self.frames_reused = 0
+
+    @property
+    def stream_path(self):
+        return self.movie_file_path.with_name(self.movie_file_path.name + ".part")
+
+    def open_stream(self):
+        if self.stream is None:
+            self.stream = StreamEncodeJob(self._create_segment_encoder(self.stream_path),
+                                          self.settings.encoder_queue_size)
+
+    def segment_cached(self, hash_invocation):
+        if not self.streaming:
+            return super().segment_cached(hash_invocation)
+        frames = self.memo.get(hash_invocation)
+        if frames is None:
+            return False
+        self.memo.move_to_end(hash_invocation)
+        self.open_stream()
+        for repeat, pixels in frames:
+            # the lookup comes before the play is counted
+            self.stream.put(repeat, pixels, self.plays)
+            self.frames_reused += repeat
+        return True
+
+    def add_partial_movie_file(self, hash_animation):
+        super().add_partial_movie_file(hash_animation)
+        self.current_hash = hash_animation
+
+    def begin_animation(self, allow_write=False, *, animation_index, file_path=None):
+        if not self.streaming:
+            return super().begin_animation(allow_write, animation_index=animation_index, file_path=file_path)
+        if allow_write:
+            self.open_stream()
+            # plays rendered with caching disabled have no reusable hash
+            cacheable = self.current_hash is not None and not self.current_hash.startswith("uncached_")
+            self.recording = [] if cacheable else None
+            self.recording_bytes = 0
+
+    def end_animation(self, allow_write=False):
+        if not self.streaming:
+            return super().end_animation(allow_write)
+        if self.recording is not None:
+            self.memo[self.current_hash] = self.recording
+            self.memo_bytes += self.recording_bytes
+            while self.memo_bytes > self.max_memo_bytes:
+                _, frames = self.memo.popitem(last=False)
+                self.memo_bytes -= sum(pixels.nbytes for _, pixels in frames)
+        self.recording = None
+
+    def write_frame(self, pixels, *, repeat=1):
+        if not self.streaming:
+            return super().write_frame(pixels, repeat=repeat)
+        if self.stream is not None:
+            self.stream.put(repeat, pixels, self.plays - 1)
+        # frames are copies of the camera's pixels, so keeping them is safe
+        if self.recording is not None:
+            self.recording.append((repeat, pixels))
+            self.recording_bytes += pixels.nbytes
+            if self.recording_bytes > self.max_memo_bytes:
+                self.recording = None
+
+    def segment_stats(self):
+        stats = super().segment_stats()
+        stats["frames_reused"] = self.frames_reused
+        return stats
+
+    def abort_encode_jobs(self, reraise_encoder_failures=False):
+        if self.stream is not None:
+            stream, self.stream = self.stream, None
+            stream.close(abort=True)
+        super().abort_encode_jobs(reraise_encoder_failures)
+
+    def finish(self):
+        if not self.streaming:
+            return super().finish()
+        if self.stream is None:
+            logger.info("No animations are contained in this scene.")
+        else:
+            stream, self.stream = self.stream, None
+            stream.close()
+            os.replace(self.stream_path, self.movie_file_path)
+            if self.includes_sound:
+                logger.warning("RENDER_MODE=stream does not add sound to %s", self.movie_file_path)
+            self.print_file_ready_message(self.movie_file_path)
+        if self.subcaptions:
+            self.write_subcaption_file()
+
+
+class HoldStreamFileWriter(StreamFileWriter, HoldFileWriter):
+    pass
+
+
+# File writer for the current RENDER_MODE. "stream" encodes the whole
+# scene into one file as it renders (held frames too, with "hold").
+def file_writer_class():
+    modes = render_modes()
+    if "stream" in modes:
+        return HoldStreamFileWriter if "hold" in modes else StreamFileWriter
+    if "hold" in modes:
+        return HoldFileWriter
+    return SegmentFileWriter
+
+
+# Renderer for the current RENDER_MODE. "profile" times every play and
+# wait call and writes a report to media/profile when the scene ends.
+# "stills" writes the last frame of every play (of every section with
+# "sections") to media/stills as PNG (WebP with "webp") instead of a video,
+# so it cannot be profiled.
+def renderer_class():
+    modes = render_modes()
+    if "stills" in modes:
+        if "profile" in modes:
+            logger.warning("RENDER_MODE=profile is ignored with stills, which renders no video")
+        return functools.partial(StillsRenderer, per_section="sections" in modes,
+                                 image_format="webp" if "webp" in modes else "png")
+    if "profile" in modes:
+        return ProfilingRenderer
+    return CairoRenderer
+
+
+# Hash of the mobjects on screen and of every mobject held in a local
+# variable of construct(), i.e. everything a later section can build on
+def state_digest(scene, namespace):
+    held = {name: value for name, value in namespace.items()
+            if isinstance(value, (Mobject, list, tuple, dict)) and name != "self"}
+    state = get_json([scene.mobjects, held])
+    return hashlib.sha256(state.encode()).hexdigest()
+
+
+class FastScene(Scene):
+    # A Scene that renders through the file writer picked by RENDER_MODE.
+    # Scenes only need to subclass this instead of Scene.
+
+    # set by Common/sections.py when it needs the state every section starts from
+    track_sections = False
+
+    def __init__(self, renderer=None, **kwargs):
+        if renderer is None and config.renderer == RendererType.CAIRO:
+            renderer = renderer_class()(
+                file_writer_class=file_writer_class(),
+                camera_class=kwargs.get("camera_class", Camera),
+                skip_animations=kwargs.get("skip_animations", False),
+            )
+        super().__init__(renderer=renderer, **kwargs)
+        glyph_cache.install()
+
+        # (name, index of the first play, source line, start state) for every
+        # section, see Common/sections.py
+        self.section_starts = [("unnamed", 0, None, None)]
+
+    def next_section(self, name="unnamed", section_type=DefaultSectionType.NORMAL, skip_animations=False):
+        if self.section_starts[-1][1] == self.renderer.num_plays:
+            self.section_starts.pop()
+        caller = sys._getframe(1)
+        state = state_digest(self, caller.f_locals) if self.track_sections else None
+        self.section_starts.append((name, self.renderer.num_plays, caller.f_lineno, state))
+        if hasattr(self.renderer, "section_changed"):
+            self.renderer.section_changed(self, name)
+        super().next_section(name, section_type, skip_animations)
+
+    def tear_down(self):
+        super().tear_down()
+        if hasattr(self, "factories"):
+            self.factories.report()
+        if TEXTS.hits + TEXTS.misses:
+            TEXTS.report()
+        if glyph_cache.GLYPHS is not None:
+            glyph_cache.GLYPHS.report()
+            glyph_cache.GLYPHS.evict()
+        writer = getattr(self.renderer, "file_writer", None)
+        if isinstance(writer, SegmentFileWriter) and writer.segments:
+            write_segment_stats(type(self).__name__, writer.segment_stats())
@@ -0,0 +1,210 @@
+# Render the sections of a scene in parallel and join them without re-encoding.
+#
+# Scenes mark their sections with self.next_section("name") (FastScene keeps
+# track of where each one starts). Every section is rendered by its own manim
+# process with -n first,last, which runs construct() up to the section with
+# animations skipped, so each part starts from the right scene state.
+#
+#   python -m Common.sections Transformations/transformations.py Transformations -j 16
+#
+# Rendered sections are kept in media/section_cache under a hash of their
+# part of construct(), the state they start from and the render settings,
+# so only sections that changed since the last run are rendered again.
+
+import argparse
+import hashlib
+import importlib.util
+import inspect
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+import av
+import manim
+from manim import tempconfig
+
+from Common.render import render_modes
+
+COMMON = Path(__file__).resolve().parent
+
+
+# Import a scene class from the script at path
+def load_scene(path, scene_name):
+    spec = importlib.util.spec_from_file_location(Path(path).stem, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return getattr(module, scene_name)
+
+
+# Run the scene with animations skipped and nothing written, and return
+# its sections as (name, first play, last play, cache key)
+def find_sections(path, scene_name, quality="h"):
+    scene_class = load_scene(path, scene_name)
+    scene_class.track_sections = True
+    with tempconfig({"dry_run": True, "disable_caching": True}):
+        scene = scene_class(skip_animations=True)
+        scene.render()
+
+    starts = scene.section_starts
+    ends = [start for _, start, _, _ in starts[1:]] + [scene.renderer.num_plays]
+    codes = section_code(scene_class, [line for _, _, line, _ in starts])
+    context = render_context(scene_class, quality)
+    return [(name, start, end - 1, section_key(code, state, context))
+            for (name, start, _, state), end, code in zip(starts, ends, codes) if end > start]
+
+
+# The lines of construct() from each next_section call up to the next one
+def section_code(scene_class, lines):
+    source, first = inspect.getsourcelines(scene_class.construct)
+    bounds = [first if line is None else line for line in lines] + [first + len(source)]
+    return ["".join(source[a - first:b - first]) for a, b in zip(bounds, bounds[1:])]
+
+
+# Everything besides construct() that a rendered section depends on: the
+# rest of the script, the shared helpers and the render settings
+def render_context(scene_class, quality):
+    script = inspect.getsource(sys.modules[scene_class.__module__])
+    script = script.replace(inspect.getsource(scene_class.construct), "")
+    helpers = [p.read_text() for p in sorted(COMMON.glob("*.py"))]
+    settings = [quality, ",".join(sorted(render_modes())), manim.__version__]
+    return "\0".join([script] + helpers + settings)
+
+
+def section_key(code, state, context):
+    digest = hashlib.sha256()
+    for part in (code, state or "", context):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class SectionCache:
+    # Rendered sections on disk, one <key>.mp4 each. A file's mtime is
+    # bumped whenever it is used, and the least recently used files are
+    # removed once the cache grows past max_bytes.
+    def __init__(self, directory, max_bytes):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key):
+        return self.directory / (key + ".mp4")
+
+    def get(self, key):
+        path = self.path(key)
+        if not path.exists():
+            self.misses += 1
+            return None
+        self.hits += 1
+        os.utime(path)
+        return path
+
+    # Copy a rendered section in, so a half written file is never picked up
+    def put(self, key, source):
+        path = self.path(key)
+        partial = path.with_suffix(".part")
+        shutil.copyfile(source, partial)
+        os.replace(partial, path)
+        return path
+
+    # Remove least recently used sections, never the ones in keep
+    def evict(self, keep=()):
+        keep = {self.path(key) for key in keep}
+        files = sorted(self.directory.glob("*.mp4"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in files)
+        for path in files:
+            if total <= self.max_bytes:
+                break
+            if path in keep:
+                continue
+            total -= path.stat().st_size
+            path.unlink()
+
+
+# Render plays first..last of a scene into its own media directory
+def render_section(job):
+    path, scene_name, quality, index, first, last, media_dir = job
+    name = "%s_%03d" % (scene_name, index)
+    cmd = [sys.executable, "-m", "manim", "render", "-q" + quality,
+           "--media_dir", media_dir,
+           "-n", "%d,%d" % (first, last),
+           "-o", name,
+           path, scene_name]
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+    return next(Path(media_dir).rglob(name + ".mp4"))
+
+
+# Join videos with the concat demuxer, copying packets without re-encoding
+def concat_videos(inputs, output):
+    manifest = "".join("file '%s'\n" % Path(p).resolve().as_posix() for p in inputs)
+    source = av.open(BytesIO(manifest.encode()), format="concat", options={"safe": "0", "an": "1"})
+    stream = source.streams.video[0]
+
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    target = av.open(str(output), mode="w")
+    target_stream = target.add_stream_from_template(template=stream)
+    for packet in source.demux(stream):
+        # skip the flushing packets demux generates; the others keep the
+        # dts the concat demuxer already offset for their file
+        if packet.dts is None:
+            continue
+        packet.stream = target_stream
+        target.mux(packet)
+
+    source.close()
+    target.close()
+
+
+# Render the sections missing from the cache (all of them without one)
+# and join every section into output
+def render_parallel(path, scene_name, output, quality="h", jobs=None, cache=None):
+    path = os.path.abspath(path)
+    sections = find_sections(path, scene_name, quality)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        parts = [cache.get(key) if cache else None for _, _, _, key in sections]
+        work = [(path, scene_name, quality, i, first, last, os.path.join(tmp, str(i)))
+                for i, (name, first, last, key) in enumerate(sections) if parts[i] is None]
+        if work:
+            with ProcessPoolExecutor(min(jobs or os.cpu_count(), len(work))) as pool:
+                for job, part in zip(work, pool.map(render_section, work)):
+                    i = job[3]
+                    parts[i] = cache.put(sections[i][3], part) if cache else part
+        concat_videos(parts, output)
+
+    if cache:
+        cache.evict(keep=[key for _, _, _, key in sections])
+    return sections
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the sections of a scene in parallel.")
+    parser.add_argument("path")
+    parser.add_argument("scene")
+    parser.add_argument("-o", "--output", help="defaults to media/<scene>.mp4")
+    parser.add_argument("-q", "--quality", default="h", choices=["l", "m", "h", "p", "k"])
+    parser.add_argument("-j", "--jobs", type=int, default=None)
+    parser.add_argument("--cache-dir", default=os.path.join("media", "section_cache"))
+    parser.add_argument("--cache-size", type=int, default=2048, help="cache size limit in MB")
+    parser.add_argument("--no-cache", action="store_true", help="render every section")
+    args = parser.parse_args()
+
+    output = args.output or os.path.join("media", args.scene + ".mp4")
+    cache = None if args.no_cache else SectionCache(args.cache_dir, args.cache_size * 1024 * 1024)
+    sections = render_parallel(args.path, args.scene, output, args.quality, args.jobs, cache)
+    if cache:
+        print("%d sections (%d cached, %d rendered) -> %s" % (len(sections), cache.hits, cache.misses, output))
+    else:
+        print("%d sections -> %s" % (len(sections), output))
+
+
+if __name__ == "__main__":
+    main()
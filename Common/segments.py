@@ -0,0 +1,53 @@
+# Which plays of a scene reused an already rendered segment. A play is
+# keyed by manim's hash of the mobjects it starts from, its animations
+# with their parameters and run times, and the camera; FastScene writes the
+# lookups of every render to media/segments/<Scene>.json, e.g.
+#
+#   python -m Common.segments
+#   python -m Common.segments media/segments/Transformations.json --top 5
+
+import argparse
+import json
+from collections import Counter
+from pathlib import Path
+
+from manim import *
+
+DEFAULT_DIR = Path("media") / "segments"
+
+
+def write_segment_stats(scene_name, stats, directory=None):
+    directory = Path(directory or Path(config.media_dir) / "segments")
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / (scene_name + ".json")
+    path.write_text(json.dumps(stats, indent=1))
+    lookups = stats["hits"] + stats["misses"]
+    logger.info("Segments: %d hits, %d misses (%.0f%% hit rate), written to %s",
+                stats["hits"], stats["misses"], 100 * stats["hits"] / lookups, path)
+
+
+def summary(name, stats, top):
+    plays = stats["plays"]
+    lines = ["%s: %d plays, %d hits, %d misses" % (name, len(plays), stats["hits"], stats["misses"])]
+    if "frames_reused" in stats:
+        lines[0] += ", %d frames reused" % stats["frames_reused"]
+    repeated = [(h, n) for h, n in Counter(p["hash"] for p in plays).most_common(top) if n > 1]
+    for h, n in repeated:
+        first = min(p["index"] for p in plays if p["hash"] == h)
+        lines.append("  %s  %d times, first at play %d" % (h[:24], n, first))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the segment cache hits and misses of rendered scenes.")
+    parser.add_argument("files", nargs="*", help="segment files (default: %s/*.json)" % DEFAULT_DIR)
+    parser.add_argument("--top", type=int, default=3, help="most repeated segments to list per scene")
+    args = parser.parse_args()
+
+    files = [Path(f) for f in args.files] or sorted(DEFAULT_DIR.glob("*.json"))
+    for path in files:
+        print(summary(path.stem, json.loads(path.read_text()), args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import hashlib
+import re
+from pathlib import Path
+
+from PIL import Image
+from manim import *
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.utils.hashing import get_json
+
+
+class StillsRenderer(CairoRenderer):
+    # Saves the last frame of every play call (or only of every section) as
+    # an image in media/stills/<Scene>. Animations are skipped, so only the
+    # frames that are saved get drawn, and no video encoder is ever opened.
+    def __init__(self, *args, per_section=False, image_format="png", **kwargs):
+        kwargs["skip_animations"] = True
+        super().__init__(*args, **kwargs)
+        self.per_section = per_section
+        self.image_format = image_format
+        self.section = "unnamed"
+        self.sections = 0
+        # whether anything was played since the last saved still
+        self.pending = False
+        # hash of the mobjects on screen in the last saved still
+        self.last_state = None
+        self.saved = []
+
+    # the static image is only used to speed up animation frames
+    def save_static_frame_data(self, scene, static_mobjects):
+        self.static_image = None
+        return None
+
+    def play(self, scene, *args, **kwargs):
+        super().play(scene, *args, **kwargs)
+        # waits count too: scenes often add or recolor mobjects and then wait
+        self.pending = True
+        if not self.per_section:
+            self.save_still(scene, "%03d_%s" % (self.num_plays - 1, self.section))
+
+    # Called by FastScene.next_section before the new section starts
+    def section_changed(self, scene, name):
+        if self.per_section:
+            self.save_still(scene, "%02d_%s" % (self.sections, self.section))
+        self.sections += 1
+        self.section = name
+
+    def save_still(self, scene, name):
+        if not self.pending:
+            return
+        self.pending = False
+        # the same picture as the last still, e.g. a wait after a play
+        state = hashlib.sha256(get_json(scene.mobjects).encode()).hexdigest()
+        if state == self.last_state:
+            return
+        self.last_state = state
+
+        self.update_frame(scene)
+        directory = Path(config.media_dir) / "stills" / type(scene).__name__
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / ("%s.%s" % (re.sub(r"\W+", "_", name), self.image_format))
+
+        image = Image.fromarray(self.get_frame())
+        if self.image_format == "webp":
+            image.save(path, lossless=True, method=6)
+        else:
+            image.save(path, optimize=True)
+        self.saved.append(path)
+
+    def scene_finished(self, scene):
+        if self.per_section:
+            self.save_still(scene, "%02d_%s" % (self.sections, self.section))
+        if self.saved:
+            logger.info("%d stills written to %s", len(self.saved), self.saved[0].parent)
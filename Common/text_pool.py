@@ -0,0 +1,60 @@
+# Text and MarkupText built once per distinct (class, string, font, size,
+# color, ...) in the process. Pango layout and SVG parsing only happen on
+# the first request; later requests get a copy of the kept prototype that
+# shares its point arrays (as with Common.factory), so repeated strings
+# such as "YES" and "NO" or the state texts of a step-by-step run cost a
+# deep copy instead of a new layout.
+#
+# The pool keeps the most recently used MAX_TEXTS prototypes.
+
+from collections import OrderedDict
+
+from manim import *
+
+from Common.factory import freeze, share_copy
+
+MAX_TEXTS = 512
+
+
+class TextPool:
+    def __init__(self, max_texts=MAX_TEXTS):
+        self.max_texts = max_texts
+        self.prototypes = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, cls, text, **kwargs):
+        # keyed by repr, so colors and other unhashable arguments can be part of the key
+        key = (cls.__name__, text, tuple(sorted((k, repr(v)) for k, v in kwargs.items())))
+        if key in self.prototypes:
+            self.hits += 1
+            self.prototypes.move_to_end(key)
+        else:
+            self.misses += 1
+            self.prototypes[key] = freeze(cls(text, **kwargs))
+            if len(self.prototypes) > self.max_texts:
+                self.prototypes.popitem(last=False)
+                self.evictions += 1
+        return share_copy(self.prototypes[key])
+
+    def report(self):
+        logger.info("Texts: %d hits, %d misses (%.0f%% hit rate), %d evicted",
+                    self.hits, self.misses, 100 * self.hit_rate, self.evictions)
+
+
+TEXTS = TextPool()
+
+
+# Drop-in replacements for Text(...) and MarkupText(...)
+def pooled_text(text, **kwargs):
+    return TEXTS.get(Text, text, **kwargs)
+
+
+def pooled_markup(text, **kwargs):
+    return TEXTS.get(MarkupText, text, **kwargs)
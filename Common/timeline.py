@@ -0,0 +1,101 @@
+# Print when every play and wait of a scene starts, without drawing or
+# encoding a single frame, e.g. to line up waits with the narration:
+#
+#   python -m Common.timeline Transformations/transformations.py Transformations
+#
+# construct() still runs in full, so mobjects (and their Tex, which is
+# cached in media/Tex after the first run) are built as usual; animations
+# jump straight to their end and the renderer only advances the clock.
+
+import argparse
+import json
+
+from manim import *
+from manim.renderer.cairo_renderer import CairoRenderer
+
+from Common.profiling import describe, source_line
+from Common.sections import load_scene
+
+
+class TimelineRenderer(CairoRenderer):
+    # Skips every animation, never rasterizes, and records the time at
+    # which each play call starts
+    def __init__(self, *args, **kwargs):
+        kwargs["skip_animations"] = True
+        super().__init__(*args, **kwargs)
+        self.timeline = []
+
+    def update_frame(self, *args, **kwargs):
+        pass
+
+    def get_frame(self):
+        return self.camera.pixel_array
+
+    def play(self, scene, *args, **kwargs):
+        line = source_line()
+        start = self.time
+        super().play(scene, *args, **kwargs)
+
+        animations = scene.animations or []
+        self.timeline.append({
+            "index": len(self.timeline),
+            "start": round(start, 4),
+            "duration": round(scene.duration, 4),
+            "kind": "wait" if all(isinstance(a, Wait) for a in animations) else "play",
+            "line": line,
+            "animations": describe(animations),
+        })
+
+
+# Run a scene with the timeline renderer and return its timeline.
+# Entries of FastScene scenes get the name of their section.
+def scene_timeline(path, scene_name):
+    scene_class = load_scene(path, scene_name)
+    with tempconfig({"dry_run": True, "disable_caching": True, "write_to_movie": False}):
+        renderer = TimelineRenderer()
+        scene = scene_class(renderer=renderer)
+        scene.render()
+
+    timeline = renderer.timeline
+    starts = {entry[1]: entry[0] for entry in getattr(scene, "section_starts", [])}
+    section = None
+    for entry in timeline:
+        section = starts.get(entry["index"], section)
+        entry["section"] = section
+    return timeline
+
+
+def format_time(t):
+    return "%d:%05.2f" % (t // 60, t % 60)
+
+
+def print_timeline(timeline):
+    section = None
+    for entry in timeline:
+        if entry["section"] != section:
+            section = entry["section"]
+            print("-- %s" % section)
+        print("%4d %8s %7.2fs  %-4s %-26s %s" % (
+            entry["index"], format_time(entry["start"]), entry["duration"],
+            entry["kind"], entry["line"], entry["animations"]))
+    if timeline:
+        end = timeline[-1]["start"] + timeline[-1]["duration"]
+        print("%d calls, %s total" % (len(timeline), format_time(end)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the timeline of a scene without rendering it.")
+    parser.add_argument("path")
+    parser.add_argument("scene")
+    parser.add_argument("--json", action="store_true", help="print the timeline as JSON")
+    args = parser.parse_args()
+
+    timeline = scene_timeline(args.path, args.scene)
+    if args.json:
+        print(json.dumps(timeline, indent=2))
+    else:
+        print_timeline(timeline)
+
+
+if __name__ == "__main__":
+    main()
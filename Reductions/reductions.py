@@ -1,16 +1,27 @@
+import os
+import sys
 from manim import *
 from manim.utils.color import Colors
 
-class Reductions(Scene):
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Common.factory import factory
+from Common.graph import complete_graph, clique_plus_graph, dumbbell_graph, merged_lines
+from Common.reduction import adjacency, check_example, has_dumbbell
+from Common.render import FastScene
+from Common.text_pool import pooled_markup, pooled_text
+
+class Reductions(FastScene):
     def construct(self):
         
+        self.next_section("intro")
         # Today we are going to look at an example of reductions.
-        text = Text("Reductions", font_size = 90)
+        text = pooled_text("Reductions", font_size = 90)
         self.add(text)
         self.wait(5)
         self.play(FadeOut(text))
         self.remove(text)
 
+        self.next_section("clique")
         # Let's look at the known NP-Hard problem CLIQUE.
         clique_text = Tex(r"CLIQUE", font_size = 70)
         self.play(FadeIn(clique_text))
@@ -23,9 +34,9 @@ class Reductions(Scene):
         # does G have a subset of vertices of size greater than or equal to k
         # where every two vertices are connected by an edge?
 
-        txt1 = MarkupText(f'Given an undirected graph G and an integer k,', font_size = 30, color=BLUE).shift(1.4*UP)
-        txt2 = MarkupText(f'does G have a subset of vertices of size greater than or equal to k', font_size = 30, color=BLUE)
-        txt3 = MarkupText(f'where every two vertices are connected by an edge?', font_size = 30, color=BLUE).shift(1.4*DOWN)
+        txt1 = pooled_markup(f'Given an undirected graph G and an integer k,', font_size = 30, color=BLUE).shift(1.4*UP)
+        txt2 = pooled_markup(f'does G have a subset of vertices of size greater than or equal to k', font_size = 30, color=BLUE)
+        txt3 = pooled_markup(f'where every two vertices are connected by an edge?', font_size = 30, color=BLUE).shift(1.4*DOWN)
 
         self.play(FadeIn(txt1))
         self.wait(3)
@@ -68,6 +79,7 @@ class Reductions(Scene):
         self.play(FadeOut(clique_text))
         self.wait(3)
 
+        self.next_section("dumbbell")
         # We know that the problem CLIQUE is NP-Hard.
         # Now consider the following: DUMBBELL.
         
@@ -82,7 +94,7 @@ class Reductions(Scene):
         dumbbell1 = self.dumbbell()
         self.play(FadeIn(dumbbell1))
         self.wait(0.5)
-        subtxt = MarkupText(f'(7, 7)-dumbbell', font_size = 30, color=BLUE).shift(2.5*DOWN)
+        subtxt = pooled_markup(f'(7, 7)-dumbbell', font_size = 30, color=BLUE).shift(2.5*DOWN)
         self.play(FadeIn(subtxt))
         self.wait(4.5)
         self.play(FadeOut(subtxt))
@@ -91,8 +103,8 @@ class Reductions(Scene):
         # Then, the DUMBBELL problem is the following:
         # Given an undirected graph G and an integer k,
         # does G contain a (k, k)-dumbbell as a subgraph?
-        txt1 = MarkupText(f'Given an undirected graph G and an integer k', font_size = 30, color=BLUE).shift(0.7*UP)
-        txt2 = MarkupText(f'does G contain a (k, k)-dumbbell as a subgraph?', font_size = 30, color=BLUE).shift(0.7*DOWN)
+        txt1 = pooled_markup(f'Given an undirected graph G and an integer k', font_size = 30, color=BLUE).shift(0.7*UP)
+        txt2 = pooled_markup(f'does G contain a (k, k)-dumbbell as a subgraph?', font_size = 30, color=BLUE).shift(0.7*DOWN)
         self.play(FadeIn(txt1))
         self.wait(3)
         self.play(FadeIn(txt2))
@@ -102,13 +114,14 @@ class Reductions(Scene):
         self.play(FadeOut(dumbbell_text))
         self.wait(9)
 
+        self.next_section("reduction")
         # in order to prove that DUMBBELL is NP-Hard, 
         # we need to prove that some known NP-Hard problem is reducible to DUMBBELL.
         # we pick CLIQUE, because they are similar problems.
         # so how do we reduce from CLIQUE to DUMBBELL?
         # we need to prove that for each DUMBBELL instance we have a corresponding CLIQUE instance.
-        txt1 = MarkupText(f'CLIQUE -> DUMBBELL', font_size = 30, color=BLUE).shift(0.7*UP)
-        txt2 = MarkupText(f'Prove that for each DUMBBELL we have a corresponding CLIQUE.', font_size = 30, color=BLUE).shift(0.7*DOWN)
+        txt1 = pooled_markup(f'CLIQUE -> DUMBBELL', font_size = 30, color=BLUE).shift(0.7*UP)
+        txt2 = pooled_markup(f'Prove that for each DUMBBELL we have a corresponding CLIQUE.', font_size = 30, color=BLUE).shift(0.7*DOWN)
 
         self.play(FadeIn(txt1))
         self.wait(9)
@@ -122,22 +135,22 @@ class Reductions(Scene):
         # and if that particular CLIQUE instance produces a NO output, 
         # then this particular DUMBBELL problem must also produce a NO output."
 
-        txt1 = MarkupText(f'CLIQUE', font_size = 30, color=BLUE).shift(1.5*UP)
-        txt2 = MarkupText(f'Does this graph have a k-clique?', font_size = 20, color=BLUE).shift(1.0*UP)
+        txt1 = pooled_markup(f'CLIQUE', font_size = 30, color=BLUE).shift(1.5*UP)
+        txt2 = pooled_markup(f'Does this graph have a k-clique?', font_size = 20, color=BLUE).shift(1.0*UP)
         gsq1 = Rectangle(width=2.0, height=2.0,  color=YELLOW).shift(1.5*UP+4.0*LEFT)
         arrow1 = Arrow(start=0.75*LEFT, end=0.75*RIGHT, color=WHITE, max_stroke_width_to_length_ratio=2, max_tip_length_to_length_ratio=0.1).shift(2.5*LEFT + 1.5*UP)
         arrow2 = Arrow(start=0.75*LEFT, end=0.75*RIGHT, color=WHITE, max_stroke_width_to_length_ratio=2, max_tip_length_to_length_ratio=0.1).shift(2.5*RIGHT + 1.5*UP)
-        txtG = MarkupText(f'G', font_size = 30, color=YELLOW).shift(1.5*UP+4.0*LEFT)
-        txt3 = MarkupText(f'DUMBBELL', font_size = 30, color=BLUE).shift(1.5*DOWN)
-        txt4 = MarkupText(f'Does this graph have a (k, k)-dumbbell?', font_size = 20, color=BLUE).shift(2.0*DOWN)
+        txtG = pooled_markup(f'G', font_size = 30, color=YELLOW).shift(1.5*UP+4.0*LEFT)
+        txt3 = pooled_markup(f'DUMBBELL', font_size = 30, color=BLUE).shift(1.5*DOWN)
+        txt4 = pooled_markup(f'Does this graph have a (k, k)-dumbbell?', font_size = 20, color=BLUE).shift(2.0*DOWN)
         gsq2 = Rectangle(width=2.0, height=2.0,  color=PINK).shift(1.5*DOWN+4.0*LEFT)
         arrow3 = Arrow(start=0.75*LEFT, end=0.75*RIGHT, color=WHITE, max_stroke_width_to_length_ratio=2, max_tip_length_to_length_ratio=0.1).shift(2.5*LEFT + 1.5*DOWN)
         arrow4 = Arrow(start=0.75*LEFT, end=0.75*RIGHT, color=WHITE, max_stroke_width_to_length_ratio=2, max_tip_length_to_length_ratio=0.1).shift(2.5*RIGHT + 1.5*DOWN)
-        txtP = MarkupText(f'G\'', font_size = 30, color=PINK).shift(1.5*DOWN+4.0*LEFT)
-        txtY1 = MarkupText(f'YES', font_size = 32, color=BLUE).shift(1.5*UP+4.0*RIGHT)
-        txtY2 = MarkupText(f'YES', font_size = 32, color=BLUE).shift(1.5*DOWN+4.0*RIGHT)
-        txtN1 = MarkupText(f'NO', font_size = 32, color=BLUE).shift(1.5*UP+4.0*RIGHT)
-        txtN2 = MarkupText(f'NO', font_size = 32, color=BLUE).shift(1.5*DOWN+4.0*RIGHT)
+        txtP = pooled_markup(f'G\'', font_size = 30, color=PINK).shift(1.5*DOWN+4.0*LEFT)
+        txtY1 = pooled_markup(f'YES', font_size = 32, color=BLUE).shift(1.5*UP+4.0*RIGHT)
+        txtY2 = pooled_markup(f'YES', font_size = 32, color=BLUE).shift(1.5*DOWN+4.0*RIGHT)
+        txtN1 = pooled_markup(f'NO', font_size = 32, color=BLUE).shift(1.5*UP+4.0*RIGHT)
+        txtN2 = pooled_markup(f'NO', font_size = 32, color=BLUE).shift(1.5*DOWN+4.0*RIGHT)
         gtop = Group(txt1, txt2, gsq1, arrow1, arrow2, txtG)
         gbot = Group(txt3, txt4, gsq2, arrow3, arrow4, txtP)
         gyes = Group(txtY1, txtY2)
@@ -159,6 +172,7 @@ class Reductions(Scene):
         self.wait(1)
 
 
+        self.next_section("k7")
         # How do we do this?
         # Let's start by considering the problem CLIQUE, where k=7.
         # The output of this problem tells us if a graph has a 7-clique or not.
@@ -169,6 +183,7 @@ class Reductions(Scene):
         self.wait(10)
         self.play(FadeOut(clique_text, k7_text))
 
+        self.next_section("construction")
         # Now, imagine an arbitrary graph G.
         # Right now we don't know what G looks like, or if G has a 7-clique or not.
 
@@ -176,7 +191,7 @@ class Reductions(Scene):
         self.play(FadeIn(clique1))
         self.wait(2)
         gsq1 = Rectangle(width=4.0, height=4.0, color=YELLOW)
-        txtG = MarkupText(f'G', font_size = 65, color=YELLOW)
+        txtG = pooled_markup(f'G', font_size = 65, color=YELLOW)
         box1 = Group(gsq1, txtG)
         self.play(Transform(clique1, box1))
         self.wait(9)
@@ -186,7 +201,7 @@ class Reductions(Scene):
 
         self.play(clique1.animate.shift(2.0*LEFT).scale(0.6), run_time=1)
         gsq1 = Rectangle(width=4.0, height=4.0, color=PINK)
-        txtG = MarkupText(f'G\'', font_size = 65, color=PINK)
+        txtG = pooled_markup(f'G\'', font_size = 65, color=PINK)
         box2 = Group(gsq1, txtG).shift(2.0*RIGHT).scale(0.6)
         self.play(FadeIn(box2))
         self.play(FadeOut(clique1), box2.animate.shift(2.0*LEFT), run_time=1)
@@ -202,17 +217,15 @@ class Reductions(Scene):
         # Now, choose one of the vertices from the 7-clique,
         # and connect it to every vertex in G'.
 
-        vertex = clique1[0][3]
-        lines = VGroup()
-        for i in range(6):
-            l1 = Line(vertex)
-            l1.put_start_and_end_on(vertex.get_center(), (1.5-0.6*i)*UP+0.8*LEFT)
-            lines.add(l1) 
+        vertex = clique1[0][2]
+        ends = [(1.5-0.6*i)*UP+0.8*LEFT for i in range(6)]
+        lines = merged_lines([vertex.get_center()]*6, ends, vertex.width/2)
         self.play(FadeIn(lines))
         self.wait(5)
         self.play(FadeOut(box2, clique1, lines))
         self.wait(2)
 
+        self.next_section("yes example")
         # For example, if G looks like this:
 
         clique1 = self.clique_alt()
@@ -225,11 +238,8 @@ class Reductions(Scene):
 
         self.play(clique1.animate.shift(2.5*LEFT))
         clique2 = self.clique().shift(2.5*RIGHT+0.2*DOWN)
-        vertex = clique2[0][3]
-        lines = VGroup()
-        for i in range(len(clique1[0])):
-            l1 = Line(vertex, clique1[0][i])
-            lines.add(l1) 
+        vertex = clique2[0][2]
+        lines = self.connect(vertex, clique1[0])
         self.play(FadeIn(clique2, lines))
         self.wait(1)
         for i in range(6):
@@ -241,6 +251,7 @@ class Reductions(Scene):
         self.play(FadeOut(clique1, clique2, lines))
         self.wait(1.8)
 
+        self.next_section("no example")
         # and if G looks like this:
 
         tri1 = self.triangle()
@@ -252,23 +263,21 @@ class Reductions(Scene):
 
         self.play(tri1.animate.shift(2.5*LEFT))
         clique2 = self.clique().shift(2.5*RIGHT)
-        vertex = clique2[0][3]
-        lines = VGroup()
-        for i in range(len(tri1[0])):
-            l1 = Line(vertex, tri1[0][i])
-            lines.add(l1) 
+        vertex = clique2[0][2]
+        lines = self.connect(vertex, tri1[0])
         self.play(FadeIn(clique2, lines))
         self.wait(7)
         self.play(FadeOut(tri1, clique2, lines))
         self.wait(8)
 
+        self.next_section("conclusion")
         # if we apply this graph transformation to every instance,
         # we can claim that G' has a (k, k)-dumbbell 
         # if and only if G has a clique of size k.
         # IMPORTANT!
 
-        txt1 = MarkupText(f'G\' has a (k, k)-dumbbell...', font_size = 30, color=BLUE).shift(0.7*UP)
-        txt2 = MarkupText(f'if and only if G has a clique of size k.', font_size = 30, color=BLUE).shift(0.7*DOWN)
+        txt1 = pooled_markup(f'G\' has a (k, k)-dumbbell...', font_size = 30, color=BLUE).shift(0.7*UP)
+        txt2 = pooled_markup(f'if and only if G has a clique of size k.', font_size = 30, color=BLUE).shift(0.7*DOWN)
 
         self.play(FadeIn(txt1))
         self.wait(2.5)
@@ -282,113 +291,44 @@ class Reductions(Scene):
         # we can say that DUMBBELL is at least as hard as CLIQUE.
         # Then, since CLIQUE is NP-Hard, DUMBBELL is NP-Hard.
 
-        txt1 = MarkupText(f'CLIQUE -> DUMBBELL', font_size = 50, color=WHITE)
+        txt1 = pooled_markup(f'CLIQUE -> DUMBBELL', font_size = 50, color=WHITE)
         self.play(FadeIn(txt1))
         self.wait(16)
 
 
-    def clique(self):
-        c1 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(0.0*LEFT + 1.6*UP)
-        c2 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(1.4*LEFT + 0.87*UP)
-        c3 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(1.4*RIGHT + 0.87*UP)
-        c4 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(1.8*LEFT + 0.26*DOWN)
-        c5 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(1.8*RIGHT + 0.26*DOWN)
-        c6 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(0.9*LEFT + 1.4*DOWN)
-        c7 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(0.9*RIGHT + 1.4*DOWN)
-        
-        clique = Group(c1, c2, c3, c4, c5, c6, c7)
-        lines = VGroup()
-        for i in range(7):
-            for j in range(7):
-                if i != j:
-                    l1 = Line(clique[i], clique[j])
-                    lines.add(l1)
+    # Lines from vertex to every vertex in vertices, as one merged stroke
+    def connect(self, vertex, vertices):
+        ends = [v.get_center() for v in vertices]
+        radii = [v.width/2 for v in vertices]
+        return merged_lines([vertex.get_center()]*len(ends), ends, vertex.width/2, radii)
 
-        clique1 = Group(clique, lines)
-        return clique1
+    # Vertices on a computed circle, each undirected edge drawn once
+    @factory
+    def clique(self):
+        g = complete_graph(self, 7, radii=0.1, colors=PINK, opacities=0.5)
+        check_example(len(g.positions), g.edge_index, 7, True)
+        return Group(g.vertices, g.edges)
 
+    # a 7-clique with four extra vertices hanging off it
+    @factory
     def clique_alt(self):
-        c1 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(0.0*LEFT + 1.6*UP)
-        c2 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(1.4*LEFT + 0.87*UP)
-        c3 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(1.4*RIGHT + 0.87*UP)
-        c4 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(1.8*LEFT + 0.26*DOWN)
-        c5 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(1.8*RIGHT + 0.26*DOWN)
-        c6 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(0.9*LEFT + 1.4*DOWN)
-        c7 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(0.9*RIGHT + 1.4*DOWN)
-        c8 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(1.4*LEFT + 1.8*UP)
-        c9 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(1.4*RIGHT + 1.8*UP)
-        c10 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(0.9*LEFT + 1.8*DOWN)
-        c11 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(0.9*RIGHT + 1.8*DOWN)
-
-        clique = Group(c1, c2, c3, c4, c5, c6, c7, c8, c9, c10, c11)
-        lines = VGroup()
-        for i in range(7):
-            for j in range(7):
-                if i != j:
-                    l1 = Line(clique[i], clique[j])
-                    lines.add(l1)
-
-        l1 = Line(clique[7], clique[8])
-        l2 = Line(clique[1], clique[7])
-        l3 = Line(clique[2], clique[8])
-        l4 = Line(clique[9], clique[10])
-        l5 = Line(clique[5], clique[9])
-        l6 = Line(clique[6], clique[10])
-        lines.add(l1, l2, l3, l4, l5, l6)
-
-        clique1 = Group(clique, lines)
-        return clique1
-
-
+        extra_positions = [[-1.4, 1.9], [1.4, 1.9], [-0.9, -2.0], [0.9, -2.0]]
+        extra_edges = [[7, 8], [1, 7], [6, 8], [9, 10], [3, 9], [4, 10]]
+        g = clique_plus_graph(self, 7, extra_positions, extra_edges, radii=0.1, colors=PINK, opacities=0.5)
+        # the "yes example": G has a 7-clique, so G' has a (7, 7)-dumbbell
+        check_example(len(g.positions), g.edge_index, 7, True)
+        return Group(g.vertices, g.edges)
+
+    @factory
     def triangle(self):
-        c1 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(0.0*LEFT + 1.0*UP)
-        c2 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(1.0*LEFT + 1.0*DOWN)
-        c3 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(1.0*RIGHT + 1.0*DOWN)
-        
-        triangle = Group(c1, c2, c3)
-        lines = VGroup()
-        for i in range(3):
-            for j in range(3):
-                if i != j:
-                    l1 = Line(triangle[i], triangle[j])
-                    lines.add(l1)
-
-        triangle1 = Group(triangle, lines)
-        return triangle1
-            
+        g = complete_graph(self, 3, radius=1.2, center=0.3*DOWN, radii=0.1, colors=PINK, opacities=0.5)
+        # the "no example": no 7-clique in G, so no (7, 7)-dumbbell in G'
+        check_example(len(g.positions), g.edge_index, 7, False)
+        return Group(g.vertices, g.edges)
 
+    @factory
     def dumbbell(self):
-        c1 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(2.5*LEFT + 1.6*UP)
-        c2 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(3.9*LEFT + 0.87*UP)
-        c3 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(1.1*LEFT + 0.87*UP)
-        c4 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(4.3*LEFT + 0.26*DOWN)
-        c5 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(0.7*LEFT + 0.26*DOWN)
-        c6 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(3.4*LEFT + 1.4*DOWN)
-        c7 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(1.6*LEFT + 1.4*DOWN)
-        c8 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(2.5*RIGHT + 1.6*UP)
-        c9 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(1.1*RIGHT + 0.87*UP)
-        c10 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(3.9*RIGHT + 0.87*UP)
-        c11 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(0.7*RIGHT + 0.26*DOWN)
-        c12 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(4.3*RIGHT + 0.26*DOWN)
-        c13 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(1.6*RIGHT + 1.4*DOWN)
-        c14 = Circle(radius=0.1).set_fill(PINK, opacity=0.5).shift(3.4*RIGHT + 1.4*DOWN)
-
-        dumbbell = Group(c1, c2, c3, c4, c5, c6, c7, c8, c9, c10, c11, c12, c13, c14)
-
-        lines = VGroup()
-        for i in range(7):
-            for j in range(7):
-                if i != j:
-                    l1 = Line(dumbbell[i], dumbbell[j])
-                    lines.add(l1)
-
-        for i in range(7, 14):
-            for j in range(7, 14):
-                if i != j:
-                    l1 = Line(dumbbell[i], dumbbell[j])
-                    lines.add(l1)
-        l = Line(dumbbell[4], dumbbell[10])
-        lines.add(l)
-
-        dumbbell1 = Group(dumbbell, lines)
-        return dumbbell1
\ No newline at end of file
+        g = dumbbell_graph(self, 7, radii=0.1, colors=PINK, opacities=0.5)
+        if not has_dumbbell(adjacency(len(g.positions), g.edge_index), 7):
+            raise ValueError("the dumbbell drawing is not a (7, 7)-dumbbell")
+        return Group(g.vertices, g.edges)
\ No newline at end of file
@@ -1,16 +1,51 @@
+import os
+import sys
 from manim import *
 from manim.utils.color import Colors
 
-class Transformations(Scene):
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Common.arrows import StateArrows
+from Common.factory import factory
+from Common.half import half_construction
+from Common.nfa import NFA, bits, half_trace
+from Common.render import FastScene
+from Common.text_pool import pooled_markup, pooled_text
+
+# States of the example NFA for L = {aaaa, abab, abc}, in the order
+# ExampleGroup returns their circles (the names are the labels from ExampleText)
+EXAMPLE_STATES = ["s", "a", "ab", "aa", "aaa", "aaaa", "abc", "aba", "abab", "reject"]
+
+
+def example_nfa():
+    transitions = {
+        ("s", "a"): ["a"],
+        ("a", "a"): ["aa"],
+        ("aa", "a"): ["aaa"],
+        ("aaa", "a"): ["aaaa"],
+        ("a", "b"): ["ab"],
+        ("ab", "a"): ["aba"],
+        ("aba", "b"): ["abab"],
+        ("ab", "c"): ["abc"],
+    }
+    # accepting states reject anything longer
+    for state in ["aaaa", "abab", "abc"]:
+        for symbol in "abc":
+            transitions[(state, symbol)] = ["reject"]
+    return NFA(EXAMPLE_STATES, "s", ["aaaa", "abab", "abc"], transitions)
+
+
+class Transformations(FastScene):
     def construct(self):
         
+        self.next_section("intro")
         # Today we are going to talk about an example of transformations
-        text = Text("Transformations", font_size = 90)
+        text = pooled_text("Transformations", font_size = 90)
         self.add(text)
         self.wait(5)
         self.play(FadeOut(text))
         self.remove(text)
 
+        self.next_section("definition")
         # Here's the definition of half(L). The langauge half(L) contains strings that are exactly half of strings accepted in the langauge L.
         half_l_def = Tex(r"half(L) := \{w $\vert$ ww $\in$ L\}", font_size = 70)
         self.play(FadeIn(half_l_def))
@@ -21,19 +56,19 @@ class Transformations(Scene):
 
         # For example, let's say that the language L contains the following strings: aaaa, abab, abc.
         # Then half(L) contains these strings: aa, ab.
-        L = Text("L", font_size = 60, color=YELLOW)
+        L = pooled_text("L", font_size = 60, color=YELLOW)
         L_box=Rectangle(width=4.0, height=5.0,  color=YELLOW)
         L_group = Group(L, L_box).arrange(DOWN, buff=0.3)
-        half_L = Text("half(L)", font_size = 45, color=GREEN)
+        half_L = pooled_text("half(L)", font_size = 45, color=GREEN)
         half_L_box = Rectangle(width=4.0, height=5.0,  color=GREEN)
         half_L_group = Group(half_L, half_L_box).arrange(DOWN, buff=0.3)
         box_group = Group(L_group, half_L_group).arrange(RIGHT, buff=0.6)
 
-        aaaa = Text("aaaa", font_size = 40, color=YELLOW)
-        abab = Text("abab", font_size = 40, color=YELLOW)
-        abc = Text("abc", font_size = 40, color=YELLOW)
-        aa = Text("aa", font_size = 40, color=GREEN)
-        ab = Text("ab", font_size = 40, color=GREEN)
+        aaaa = pooled_text("aaaa", font_size = 40, color=YELLOW)
+        abab = pooled_text("abab", font_size = 40, color=YELLOW)
+        abc = pooled_text("abc", font_size = 40, color=YELLOW)
+        aa = pooled_text("aa", font_size = 40, color=GREEN)
+        ab = pooled_text("ab", font_size = 40, color=GREEN)
         L_ex = Group(aaaa, abab, abc).arrange(DOWN)
         half_L_ex = Group(aa, ab).arrange(DOWN)
         L_ex.shift(2.3*LEFT)
@@ -47,16 +82,17 @@ class Transformations(Scene):
         self.wait(5)
         self.play(FadeOut(box_group, L_ex, half_L_ex))
 
+        self.next_section("example nfa")
         # We can draw an NFA of L, like this. Because we know what strings are in L, 
         # we can also easily construct an NFA of half(L).
-        ex_start, ex_a, ex_ab, ex_aaa, ex_aaaa, ex_aa, ex_aba, ex_abab, ex_abc, reject = self.ExampleGroup()
-        arrow1, arrow2, arrow3, arrow4, arrow5, arrow6, arrow7, arrow8, arrow9, arrow10, arrow11, border1, border2, border3 = self.ExampleArrows()
-        arrows = Group(arrow1, arrow2, arrow3, arrow4, arrow5, arrow6, arrow7, arrow8, arrow9, arrow10, arrow11, border1, border2, border3)
+        ex_start, ex_a, ex_ab, ex_aa, ex_aaa, ex_aaaa, ex_abc, ex_aba, ex_abab, reject = self.ExampleGroup()
+        front_arrows, back_arrows, border1, border2, border3 = self.ExampleArrows()
+        arrows = Group(front_arrows, back_arrows, border1, border2, border3)
         txt1, txt2, txt3, txt4, txt5, txt6, txt7, txt8, txt9 = self.ExampleText()
         ex_txt = Group(txt1, txt2, txt3, txt4, txt5, txt6, txt7, txt8, txt9)
         txt = Group(txt4, txt5, txt6, txt7, txt8, txt9)
-        fade1 = Group(ex_aaaa, ex_aa, ex_aba, ex_abab, ex_abc, reject, arrow2, arrow3, arrow6, arrow7, arrow8, arrow9, arrow10, arrow11, border1, border2, border3, txt)
-        fade2 = Group(ex_start, ex_a, ex_ab, ex_aaa, arrow1, arrow4, arrow5, txt1, txt2, txt3)
+        fade1 = Group(ex_aaa, ex_aaaa, ex_abc, ex_aba, ex_abab, reject, back_arrows, border1, border2, border3, txt)
+        fade2 = Group(ex_start, ex_a, ex_ab, ex_aa, front_arrows, txt1, txt2, txt3)
         tempborder1 = Circle(radius=0.6).shift(1*RIGHT+2.0*UP)
         tempborder2 = Circle(radius=0.6).shift(1.5*LEFT+1.6*DOWN)
         self.play(Create(ex_start), Create(ex_a), Create(ex_aa), Create(ex_aaa), Create(ex_aaaa), Create(ex_ab), Create(ex_aba), Create(ex_abab), Create(ex_abc), Create(reject), FadeIn(arrows), FadeIn(ex_txt))
@@ -68,13 +104,14 @@ class Transformations(Scene):
         fade2.shift(2.5*LEFT)
         
 
+        self.next_section("goal")
         # But what if the language L is arbitrary?
         # Let's say we have an arbitrary language L. We don’t know what strings are inside the language L.
         # L is represented by the NFA M.
         # Our goal is to create a new NFA, that is based on M, that accepts half(L).
         # and turns out we can construct a new NFA using transformations.
-        obj_text = MarkupText(f'We are given a NFA <span fgcolor="{YELLOW}">M</span> that accepts L\n(we don\'t know what strings are in L)', font_size = 30, color=BLUE)
-        goal_text = MarkupText(f'Our goal is to create an NFA <span fgcolor="{YELLOW}">M\'</span>, based on M, that accepts half(L)', font_size = 30, color=BLUE)
+        obj_text = pooled_markup(f'We are given a NFA <span fgcolor="{YELLOW}">M</span> that accepts L\n(we don\'t know what strings are in L)', font_size = 30, color=BLUE)
+        goal_text = pooled_markup(f'Our goal is to create an NFA <span fgcolor="{YELLOW}">M\'</span>, based on M, that accepts half(L)', font_size = 30, color=BLUE)
         obj_text.shift(0.7*UP)
         goal_text.shift(0.7*DOWN)
 
@@ -84,6 +121,7 @@ class Transformations(Scene):
         self.wait(12)
         self.play(FadeOut(obj_text, goal_text))
 
+        self.next_section("strategy")
         # So how do we approach this problem?
         # Let's try with our example half(L).
         # Here's our strategy. When we receieve an input string, and we want to know if it is in half(L), 
@@ -99,7 +137,7 @@ class Transformations(Scene):
         # M’ then processes its received w on two copies of M, one starting at the start of M, 
         # and one starting at the guessed state.
         # If M’ ‘s guess is correct, then M’ will be at an accepting state of M when it finishes processing w.
-        strat = Text("Strategy", font_size = 60, color=PINK)
+        strat = pooled_text("Strategy", font_size = 60, color=PINK)
         self.play(FadeIn(strat))
         self.wait(7)
 
@@ -114,9 +152,9 @@ class Transformations(Scene):
         self.play(Create(start), Create(ac1), Create(ac2), Create(ac3), Create(ac4), Create(ac5), Create(ac6), Create(ac7), Create(ac8), Create(border), FadeIn(arbarrows))
         self.wait(0.3)
 
-        wxxxx = Text("w = xxxx", font_size = 40, color=Colors.gold_e.value)
+        wxxxx = pooled_text("w = xxxx", font_size = 40, color=Colors.gold_e.value)
         wxxxx.shift(3*DOWN)
-        wxfull = Text("ww = xxxxxxxx", font_size = 40, color=Colors.gold_e.value)
+        wxfull = pooled_text("ww = xxxxxxxx", font_size = 40, color=Colors.gold_e.value)
         wxfull.shift(3.4*DOWN)
         self.play(FadeIn(wxxxx, wxfull))
         self.wait(4)
@@ -199,17 +237,18 @@ class Transformations(Scene):
         self.wait(2)
     
 
+        self.next_section("guess")
         # Let's write down our strategy so far.
         # First, have our NFA guess the state the original NFA is in,
         # after it has processed our half-word input.
         # We can do this by having our NFA guess every state in the original NFA
         # by creating a new start state s'.
         # if the half word is valid,
-        line1 = MarkupText(f'First, have our NFA guess the state the original NFA is in,', font_size = 30, color=BLUE)
-        line2 = MarkupText(f'after it has processed our half-word input.', font_size = 30, color=BLUE)
-        line3 = MarkupText(f'Let\'s call this the halfway state.', font_size = 30, color=BLUE)
-        line4 = MarkupText(f'We can have our NFA guess every state in the original NFA.', font_size = 30, color=BLUE)
-        line5 = MarkupText(f'by creating a new start state s\'.', font_size = 30, color=BLUE)
+        line1 = pooled_markup(f'First, have our NFA guess the state the original NFA is in,', font_size = 30, color=BLUE)
+        line2 = pooled_markup(f'after it has processed our half-word input.', font_size = 30, color=BLUE)
+        line3 = pooled_markup(f'Let\'s call this the halfway state.', font_size = 30, color=BLUE)
+        line4 = pooled_markup(f'We can have our NFA guess every state in the original NFA.', font_size = 30, color=BLUE)
+        line5 = pooled_markup(f'by creating a new start state s\'.', font_size = 30, color=BLUE)
         # we are guaranteed to have one guess that is correct. it's ok if the others guesses are incorrect -- explained after.
         line1.shift(1.1*UP)
         line2.shift(0.7*UP)
@@ -224,12 +263,13 @@ class Transformations(Scene):
         self.play(FadeOut(line1, line2, line3, line4, line5))
         self.wait(4)
 
+        self.next_section("three states")
         # now we need to keep track of three things: the guessed state, the current state of the original NFA simulation,
         # and the current state of the simulation starting from the halfway state.
 
-        txt1 = MarkupText(f'Guessed State', font_size = 30, color=BLUE)
-        txt2 = MarkupText(f'Current State of Simulation from the Start', font_size = 30, color=BLUE)
-        txt3 = MarkupText(f'Current State of Simulation from Halfway', font_size = 30, color=BLUE)
+        txt1 = pooled_markup(f'Guessed State', font_size = 30, color=BLUE)
+        txt2 = pooled_markup(f'Current State of Simulation from the Start', font_size = 30, color=BLUE)
+        txt3 = pooled_markup(f'Current State of Simulation from Halfway', font_size = 30, color=BLUE)
 
         txt1.shift(0.7*UP)
         txt3.shift(0.7*DOWN)
@@ -243,6 +283,7 @@ class Transformations(Scene):
         self.play(FadeOut(txt1, txt2, txt3))
         self.wait(1)
 
+        self.next_section("copies")
         # to do this, we can create N copies of the original NFA, N equal to the amount of states in the original NFA.
         # next, we can create epsilon transitions from s' to different states in each copy of the original NFA.
         # we have now guessed every state in the NFA as the midway point. 
@@ -279,7 +320,7 @@ class Transformations(Scene):
         self.play(FadeIn(arb2, arb3, arb4, arb5))
         self.wait(5.5)
         sprime = Circle(radius=0.5, color=Colors.green_a.value).set_fill(Colors.green_e.value, opacity=0.5).shift(3.0*LEFT+0.2*DOWN)
-        sprime_txt = Text("s\'", font_size = 30, color=WHITE).shift(3.0*LEFT+0.2*DOWN)
+        sprime_txt = pooled_text("s\'", font_size = 30, color=WHITE).shift(3.0*LEFT+0.2*DOWN)
 
         
         self.play(FadeIn(sprime, sprime_txt))
@@ -308,6 +349,7 @@ class Transformations(Scene):
         self.wait(26)
         self.play(FadeOut(arbgroup1, arbgroup2, arbgroup3))
 
+        self.next_section("notation")
         #now The NFA will also run the simulation from the original starting state.
 
         # Now, if the simulation from the original starting state ends at the guessed state, then we have correctly guessed the halfway state.
@@ -354,23 +396,16 @@ class Transformations(Scene):
         self.wait(5)
         self.play(FadeOut(qp, ap, sp, tp1, tp2, tp3, tp4))
 
+        self.next_section("simulation")
         # here's how this looks with our previous example
         # example DFA, show state
         self.play(Create(ex_start), Create(ex_a), Create(ex_aa), Create(ex_aaa), Create(ex_aaaa), Create(ex_ab), Create(ex_aba), Create(ex_abab), Create(ex_abc), Create(reject), FadeIn(arrows), FadeIn(ex_txt))
         self.wait(1)
-        currStateOld = Text("current state (original): s", font_size = 30, color=Colors.gold_e.value).shift(2.8*DOWN)
-        currStateNew = Text("current state (new NFA): s', ab, ab", font_size = 30, color=Colors.gold_e.value).shift(3.2*DOWN)
-        self.play(FadeIn(currStateOld, currStateNew))
-        self.wait(1)
-        currStateOld.become(Text("current state (original): a", font_size = 30, color=Colors.gold_a.value).shift(2.8*DOWN))
-        currStateNew.become(Text("current state (new NFA): a, ab, aba", font_size = 30, color=Colors.gold_a.value).shift(3.2*DOWN))
-        ex_a.set_fill(RED, opacity=1.0)
-        self.wait(1)
-        currStateOld.become(Text("current state (original): ab", font_size = 30, color=Colors.gold_e.value).shift(2.8*DOWN))
-        currStateNew.become(Text("current state (new NFA): ab, ab, abab", font_size = 30, color=Colors.gold_e.value).shift(3.2*DOWN))
-        ex_a.set_fill(PINK, opacity=0.5)
-        ex_ab.set_fill(RED, opacity=1.0)
-        self.wait(1)
+        # in EXAMPLE_STATES order
+        ex_states = [ex_start, ex_a, ex_ab, ex_aa, ex_aaa, ex_aaaa, ex_abc, ex_aba, ex_abab, reject]
+        ex_nfa = example_nfa()
+        logger.info(half_construction(ex_nfa).report())
+        currStateOld, currStateNew = self.play_half_run(ex_nfa, "ab", ex_states)
         self.play(FadeOut(currStateOld, currStateNew))
         self.play(FadeOut(ex_start, ex_a, ex_aa, ex_aaa, ex_aaaa, ex_ab, ex_aba, ex_abab, ex_abc, reject, arrows, ex_txt))
 
@@ -379,6 +414,32 @@ class Transformations(Scene):
         
         # hopefully this video has helped you understand transformations.
 
+    # Step the half(L) NFA through word, one second per symbol: the text shows
+    # the state of M and the (p, h, q) state of M', and the circles of the
+    # current states of M turn red. Returns the two texts.
+    def play_half_run(self, nfa, word, circles):
+        fills = [(c.get_fill_color(), c.get_fill_opacity()) for c in circles]
+        texts = None
+        for i, (p, h, q) in enumerate(half_trace(nfa, word)):
+            color = Colors.gold_a.value if i % 2 else Colors.gold_e.value
+            old = pooled_text("current state (original): %s" % nfa.format(p), font_size = 30, color=color).shift(2.8*DOWN)
+            new = pooled_text("current state (new NFA): %s, %s, %s" % (nfa.format(p), nfa.names[h], nfa.format(q)), font_size = 30, color=color).shift(3.2*DOWN)
+            if texts is None:
+                texts = (old, new)
+                self.play(FadeIn(*texts))
+            else:
+                texts[0].become(old)
+                texts[1].become(new)
+                for c, (fill, opacity) in zip(circles, fills):
+                    c.set_fill(fill, opacity=opacity)
+                for state in bits(p):
+                    circles[state].set_fill(RED, opacity=1.0)
+            self.wait(1)
+
+        # the last states stay red until the NFA fades out
+        return texts
+
+    @factory
     def CircleGroup(self):
         start = Circle(radius=0.5, color=Colors.green_a.value)
         start.set_fill(Colors.green_e.value, opacity=0.5)
@@ -418,6 +479,7 @@ class Transformations(Scene):
 
         return start, ac1, ac2, ac3, ac4, ac5, ac6, ac7, ac8
 
+    @factory
     def ExampleGroup(self):
         start = Circle(radius=0.5, color=Colors.green_a.value)
         start.set_fill(Colors.green_e.value, opacity=0.5)
@@ -427,81 +489,72 @@ class Transformations(Scene):
         ex_a.set_fill(PINK, opacity=0.5)
         ex_a.shift(4.0*LEFT + 0.5*UP)
 
+        ex_ab = Circle(radius=0.5)
+        ex_ab.set_fill(PINK, opacity=0.5)
+        ex_ab.shift(4.0*LEFT + 1.6*DOWN)
+
         ex_aa = Circle(radius=0.5)
         ex_aa.set_fill(PINK, opacity=0.5)
-        ex_aa.shift(4.0*LEFT + 1.6*DOWN)
+        ex_aa.shift(1.5*LEFT + 2.0*UP)
 
         ex_aaa = Circle(radius=0.5)
         ex_aaa.set_fill(PINK, opacity=0.5)
-        ex_aaa.shift(1.5*LEFT + 2.0*UP)
+        ex_aaa.shift(0.5*RIGHT + 2.0*UP)
 
         ex_aaaa = Circle(radius=0.5)
         ex_aaaa.set_fill(PINK, opacity=0.5)
-        ex_aaaa.shift(0.5*RIGHT + 2.0*UP)
+        ex_aaaa.shift(3.3*RIGHT + 2.0*UP)
 
-        ex_ab = Circle(radius=0.5)
-        ex_ab.set_fill(PINK, opacity=0.5)
-        ex_ab.shift(3.3*RIGHT + 2.0*UP)
+        ex_abc = Circle(radius=0.5)
+        ex_abc.set_fill(PINK, opacity=0.5)
+        ex_abc.shift(1.7*LEFT + 0.5*DOWN)
 
         ex_aba = Circle(radius=0.5)
         ex_aba.set_fill(PINK, opacity=0.5)
-        ex_aba.shift(1.7*LEFT + 0.5*DOWN)
+        ex_aba.shift(0.9*RIGHT + 1.6*DOWN)
 
         ex_abab = Circle(radius=0.5)
         ex_abab.set_fill(PINK, opacity=0.5)
-        ex_abab.shift(0.9*RIGHT + 1.6*DOWN)
-
-        ex_abc = Circle(radius=0.5)
-        ex_abc.set_fill(PINK, opacity=0.5)
-        ex_abc.shift(3.3*RIGHT + 1.6*DOWN)
+        ex_abab.shift(3.3*RIGHT + 1.6*DOWN)
 
         reject = Circle(radius=0.5)
         reject.set_fill(PINK, opacity=0.5)
         reject.shift(4.0*RIGHT + 0.5*UP)
 
-        return start, ex_a, ex_aa, ex_aaa, ex_aaaa, ex_ab, ex_aba, ex_abab, ex_abc, reject
+        return start, ex_a, ex_ab, ex_aa, ex_aaa, ex_aaaa, ex_abc, ex_aba, ex_abab, reject
 
+    # The transitions of example_nfa between the ExampleGroup circles:
+    # the arrows among s, a, ab and aa (which stay on screen longer), the
+    # other arrows, and a border around each accepting state
+    @factory
     def ExampleArrows(self):
-        arrow1 = Arrow(start=1*LEFT+1.5*DOWN, end=1*RIGHT, color=WHITE, max_stroke_width_to_length_ratio=2, max_tip_length_to_length_ratio=0.1).shift(2.75*LEFT + 2.0*UP)
-        arrow2 = Arrow(start=0.75*LEFT, end=0.75*RIGHT, color=WHITE, max_stroke_width_to_length_ratio=3, max_tip_length_to_length_ratio=0.18).shift(0.5*LEFT + 2.0*UP)
-        arrow3 = Arrow(start=1.1*LEFT, end=1.1*RIGHT, color=WHITE, max_stroke_width_to_length_ratio=3, max_tip_length_to_length_ratio=0.1).shift(1.85*RIGHT + 2.0*UP)
-        arrow4 = Arrow(start=0.5*UP, end=0.5*DOWN, color=WHITE, max_stroke_width_to_length_ratio=6, max_tip_length_to_length_ratio=0.25).shift(4.0*LEFT + 1.25*UP)
-        arrow5 = Arrow(start=0.75*UP, end=0.75*DOWN, color=WHITE, max_stroke_width_to_length_ratio=3, max_tip_length_to_length_ratio=0.18).shift(4.0*LEFT + 0.55*DOWN)
-        arrow6 = Arrow(start=2.2*LEFT, end=2.2*RIGHT, color=WHITE, max_stroke_width_to_length_ratio=1, max_tip_length_to_length_ratio=0.05).shift(1.55*LEFT + 1.6*DOWN)
-        arrow7 = Arrow(start=0.9*LEFT, end=0.9*RIGHT, color=WHITE, max_stroke_width_to_length_ratio=3, max_tip_length_to_length_ratio=0.18).shift(2.05*RIGHT + 1.6*DOWN)
-        arrow8 = Arrow(start=1*LEFT, end=0.75*UP+0.8*RIGHT, color=WHITE, max_stroke_width_to_length_ratio=3, max_tip_length_to_length_ratio=0.1).shift(2.85*LEFT + 1.35*DOWN)
-        arrow9 = Arrow(start=2.8*LEFT, end=0.75*UP+2.35*RIGHT, color=WHITE, max_stroke_width_to_length_ratio=1, max_tip_length_to_length_ratio=0.05).shift(1.425*RIGHT + 0.35*DOWN)
-        arrow10 = Arrow(start=0.55*LEFT+0.5*UP, end=0.4*DOWN, color=WHITE, max_stroke_width_to_length_ratio=6, max_tip_length_to_length_ratio=0.25).shift(3.9*RIGHT + 1.15*UP)
-        arrow11 = Arrow(start=0.5*LEFT+1*DOWN, end=0.55*UP, color=WHITE, max_stroke_width_to_length_ratio=3, max_tip_length_to_length_ratio=0.15).shift(4.0*RIGHT + 0.3*DOWN)
-        border1 = Circle(radius=0.6).shift(3.3*RIGHT + 2.0*UP)
-        border2 = Circle(radius=0.6).shift(1.7*LEFT + 0.5*DOWN)
-        border3 = Circle(radius=0.6).shift(3.3*RIGHT + 1.6*DOWN)
-
-        return arrow1, arrow2, arrow3, arrow4, arrow5, arrow6, arrow7, arrow8, arrow9, arrow10, arrow11, border1, border2, border3
+        circles = self.ExampleGroup()
+        nfa = example_nfa()
+        arrows = StateArrows(circles, nfa.pairs)
+        front = arrows.among(range(4))
+        back = np.setdiff1d(np.arange(len(nfa.pairs)), front)
+        borders = [Circle(radius=0.6).move_to(circles[q]) for q in bits(nfa.accepting)]
 
+        return (arrows.group(front), arrows.group(back), *borders)
+
+    @factory
     def ExampleText(self):
-        txt1 = Text("a", font_size = 25, color=WHITE).shift(4.0*LEFT + 0.5*UP)
-        txt2 = Text("ab", font_size = 25, color=WHITE).shift(4.0*LEFT + 1.6*DOWN)
-        txt3 = Text("aa", font_size = 25, color=WHITE).shift(1.5*LEFT + 2.0*UP)
-        txt4 = Text("aaa", font_size = 25, color=WHITE).shift(0.5*RIGHT + 2.0*UP)
-        txt5 = Text("aaaa", font_size = 25, color=WHITE).shift(3.3*RIGHT + 2.0*UP)
-        txt6 = Text("abc", font_size = 25, color=WHITE).shift(1.7*LEFT + 0.5*DOWN)
-        txt7 = Text("aba", font_size = 25, color=WHITE).shift(0.9*RIGHT + 1.6*DOWN)
-        txt8 = Text("abab", font_size = 25, color=WHITE).shift(3.3*RIGHT + 1.6*DOWN)
-        txt9 = Text("reject", font_size = 25, color=WHITE).shift(4.0*RIGHT + 0.5*UP)
+        txt1 = pooled_text("a", font_size = 25, color=WHITE).shift(4.0*LEFT + 0.5*UP)
+        txt2 = pooled_text("ab", font_size = 25, color=WHITE).shift(4.0*LEFT + 1.6*DOWN)
+        txt3 = pooled_text("aa", font_size = 25, color=WHITE).shift(1.5*LEFT + 2.0*UP)
+        txt4 = pooled_text("aaa", font_size = 25, color=WHITE).shift(0.5*RIGHT + 2.0*UP)
+        txt5 = pooled_text("aaaa", font_size = 25, color=WHITE).shift(3.3*RIGHT + 2.0*UP)
+        txt6 = pooled_text("abc", font_size = 25, color=WHITE).shift(1.7*LEFT + 0.5*DOWN)
+        txt7 = pooled_text("aba", font_size = 25, color=WHITE).shift(0.9*RIGHT + 1.6*DOWN)
+        txt8 = pooled_text("abab", font_size = 25, color=WHITE).shift(3.3*RIGHT + 1.6*DOWN)
+        txt9 = pooled_text("reject", font_size = 25, color=WHITE).shift(4.0*RIGHT + 0.5*UP)
 
         return txt1, txt2, txt3, txt4, txt5, txt6, txt7, txt8, txt9
 
+    # start -> ac1 -> ... -> ac8 between the CircleGroup circles
+    @factory
     def ArbArrows(self):
-        arrow1 = Arrow(start=0.47*LEFT+0.47*DOWN, end=0.47*RIGHT+0.47*UP, color=WHITE, max_stroke_width_to_length_ratio=3, max_tip_length_to_length_ratio=0.18).shift(4.35*LEFT)
-        arrow2 = Arrow(start=0.47*LEFT+0.47*UP, end=0.47*RIGHT+0.47*DOWN, color=WHITE, max_stroke_width_to_length_ratio=3, max_tip_length_to_length_ratio=0.18).shift(3.1*LEFT)
-        arrow3 = Arrow(start=0.47*LEFT+0.47*DOWN, end=0.47*RIGHT+0.47*UP, color=WHITE, max_stroke_width_to_length_ratio=3, max_tip_length_to_length_ratio=0.18).shift(1.85*LEFT)
-        arrow4 = Arrow(start=0.47*LEFT+0.47*UP, end=0.47*RIGHT+0.47*DOWN, color=WHITE, max_stroke_width_to_length_ratio=3, max_tip_length_to_length_ratio=0.18).shift(0.6*LEFT)
-        arrow5 = Arrow(start=0.47*LEFT+0.47*DOWN, end=0.47*RIGHT+0.47*UP, color=WHITE, max_stroke_width_to_length_ratio=3, max_tip_length_to_length_ratio=0.18).shift(0.6*RIGHT)
-        arrow6 = Arrow(start=0.47*LEFT+0.47*UP, end=0.47*RIGHT+0.47*DOWN, color=WHITE, max_stroke_width_to_length_ratio=3, max_tip_length_to_length_ratio=0.18).shift(1.85*RIGHT)
-        arrow7 = Arrow(start=0.47*LEFT+0.47*DOWN, end=0.47*RIGHT+0.47*UP, color=WHITE, max_stroke_width_to_length_ratio=3, max_tip_length_to_length_ratio=0.18).shift(3.1*RIGHT)
-        arrow8 = Arrow(start=0.47*LEFT+0.47*UP, end=0.45*RIGHT+0.45*DOWN, color=WHITE, max_stroke_width_to_length_ratio=3, max_tip_length_to_length_ratio=0.18).shift(4.35*RIGHT)
-
-        arrows = Group(arrow1, arrow2, arrow3, arrow4, arrow5, arrow6, arrow7, arrow8)
-
-        return arrows
\ No newline at end of file
+        circles = self.CircleGroup()
+        arrows = StateArrows(circles, [(i, i + 1) for i in range(len(circles) - 1)])
+
+        return arrows.group()
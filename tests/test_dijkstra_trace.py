@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from Common.dijkstra_trace import (FAIL, FINALIZE, INF, POP, RELAX, dijkstra_trace, format_compare, format_dist,
+                                   frontier_steps)
+
+
+def bellman_ford(n, edges, weights, source=0):
+    dist = [INF] * n
+    dist[source] = 0
+    for _ in range(n):
+        for (u, v), w in zip(edges, weights):
+            dist[v] = min(dist[v], dist[u] + w)
+            dist[u] = min(dist[u], dist[v] + w)
+    return dist
+
+
+def test_known_distances():
+    edges = [(0, 1), (0, 2), (1, 2), (1, 3), (2, 3), (3, 4)]
+    weights = [7, 9, 10, 15, 11, 6]
+    trace, dist = dijkstra_trace(6, edges, weights)
+    assert dist == [0, 7, 9, 20, 26, INF]
+    # every reachable vertex is popped and finalized once, in order of distance
+    popped = [step[1] for step in trace if step[0] == POP]
+    assert popped == [0, 1, 2, 3, 4]
+    assert [step[1] for step in trace if step[0] == FINALIZE] == popped
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_graphs_match_bellman_ford(seed):
+    rng = random.Random(seed)
+    n = rng.randint(2, 15)
+    edges = [(u, v) for u in range(n) for v in range(u + 1, n) if rng.random() < 0.3]
+    weights = [rng.choice([rng.randint(0, 20), rng.randint(0, 40) / 4]) for _ in edges]
+    trace, dist = dijkstra_trace(n, edges, weights)
+    assert dist == pytest.approx(bellman_ford(n, edges, weights))
+    for kind, u, v, w, old, new in trace:
+        if kind == RELAX:
+            assert new < old
+        elif kind == FAIL:
+            assert new >= old
+
+
+def test_frontier_steps_group_by_popped_vertex():
+    trace, _ = dijkstra_trace(3, [(0, 1), (0, 2), (1, 2)], [1, 5, 1])
+    groups = frontier_steps(trace)
+    assert [u for u, _ in groups] == [0, 1, 2]
+    assert [(step[0], step[2]) for step in groups[0][1]] == [(RELAX, 1), (RELAX, 2)]
+    assert [(step[0], step[2], step[5]) for step in groups[1][1]] == [(RELAX, 2, 2)]
+
+
+def test_labels():
+    assert format_dist(INF) == "inf"
+    assert format_dist(7.0) == "7"
+    assert format_dist(3.5) == "3.5"
+    assert format_compare((RELAX, 0, 1, 7, INF, 7)) == "0 + 7 < inf"
+    assert format_compare((FAIL, 1, 2, 10, 14, 17)) == "7 + 10 > 14"
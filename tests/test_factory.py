@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+manim = pytest.importorskip("manim")
+
+from Common.factory import factory, freeze, share_copy
+
+
+def prototype():
+    return freeze(manim.VGroup(manim.Square(), manim.Line(manim.LEFT, manim.RIGHT)))
+
+
+def points(result):
+    return [np.array(mob.points) for mob in result.get_family()]
+
+
+@pytest.mark.parametrize("change", [
+    lambda copy: copy.shift(manim.UP),
+    lambda copy: copy.scale(2),
+    lambda copy: copy.rotate(1.0),
+    lambda copy: copy[1].set_points_by_ends(manim.ORIGIN, manim.UR),
+    lambda copy: copy[0].set_anchors_and_handles(*[np.zeros((4, 3))] * 4),
+])
+def test_changing_a_copy_leaves_the_prototype(change):
+    proto = prototype()
+    before = points(proto)
+    copy = share_copy(proto)
+    other = share_copy(proto)
+    change(copy)
+    for old, new in zip(before, points(proto)):
+        np.testing.assert_array_equal(old, new)
+    for old, new in zip(before, points(other)):
+        np.testing.assert_array_equal(old, new)
+
+
+def test_item_assignment_detaches_the_copy():
+    proto = prototype()
+    before = np.array(proto[0].points)
+    square = share_copy(proto)[0]
+    alias = square.points
+    square.points[0] = [5, 5, 5]
+    # a write through the old array still reaches the copy's own points
+    alias[1] = [7, 7, 7]
+    np.testing.assert_array_equal(square.points[:2], [[5, 5, 5], [7, 7, 7]])
+    np.testing.assert_array_equal(proto[0].points, before)
+
+
+def test_prototype_is_read_only():
+    proto = prototype()
+    with pytest.raises(ValueError):
+        proto[0].points[0] = [1, 1, 1]
+
+
+def test_factory_accepts_unhashable_arguments():
+    class Scene:
+        calls = 0
+
+        @factory
+        def dots(self, positions, color=None):
+            self.calls += 1
+            return manim.VGroup(*[manim.Dot(p, color=color) for p in positions])
+
+    scene = Scene()
+    first = scene.dots([[0, 0, 0], [1, 0, 0]], color=manim.ManimColor("#ff0000"))
+    second = scene.dots([[0, 0, 0], [1, 0, 0]], color=manim.ManimColor("#ff0000"))
+    assert scene.calls == 1
+    assert first is not second and len(second) == 2
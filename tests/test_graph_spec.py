@@ -0,0 +1,57 @@
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from Common.graph_spec import compile_spec, load_graph_spec
+
+SPEC = {
+    "vertices": [[0.3, "WHITE", 1.0, 0, 0], [0.4, "#ff0000", 0.5, 2, 1], [0.3, "BLUE", 1.0, -1, 2]],
+    "edges": [[0, 1], [1, 2]],
+    "weights": [3.5, 4],
+    "labels": {"step.1": [["A", 30, "WHITE", 1, 1], ["B", 20, "RED", "vertex", 2]]},
+}
+
+
+def write(path, spec):
+    path.write_text(json.dumps(spec))
+    return path
+
+
+def test_round_trip(tmp_path):
+    spec = load_graph_spec(write(tmp_path / "graph.json", SPEC))
+    arrays, labels = compile_spec(SPEC)
+    for name in ["positions", "radii", "colors", "opacities", "edges", "weights"]:
+        np.testing.assert_array_equal(getattr(spec, name), arrays[name])
+    np.testing.assert_array_equal(spec.positions[1], [2, 1, 0])
+    np.testing.assert_array_equal(spec.weights, [3.5, 4])
+    assert list(spec.labels) == ["step.1"]
+    rows = spec.label_rows("step.1")
+    assert [r[0] for r in rows] == ["A", "B"]
+    assert rows[1][3:] == pytest.approx([-1, 2 + 0.3 + 0.3])
+
+
+def test_edits_recompile_and_remove_stale_files(tmp_path):
+    path = write(tmp_path / "graph.json", SPEC)
+    load_graph_spec(path)
+    edited = dict(SPEC, weights=[1, 2])
+    np.testing.assert_array_equal(load_graph_spec(write(path, edited)).weights, [1, 2])
+    assert len(list((tmp_path / "__pycache__").glob("graph.*.graph"))) == 1
+
+
+def test_whole_weights_stay_integers():
+    arrays, _ = compile_spec(dict(SPEC, weights=[3, 4]))
+    assert arrays["weights"].dtype.kind == "i"
+
+
+@pytest.mark.parametrize("change, message", [
+    ({"edges": [[0, 3]]}, "edges must join"),
+    ({"weights": [1]}, "weights for"),
+    ({"weights": [-1, 2]}, "negative"),
+    ({"labels": {"g": [["A", 30, "WHITE", "vertex", 9]]}}, "missing vertex"),
+])
+def test_invalid_specs(change, message):
+    with pytest.raises(ValueError, match=message):
+        compile_spec(dict(SPEC, **change))
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from Common import layout
+from Common.layout import (barnes_hut_repulsion, cached_layout, default_iterations, exact_repulsion, fit_to_frame,
+                           force_layout, random_graph)
+
+
+@pytest.mark.parametrize("n", [50, 300, 1000])
+def test_barnes_hut_is_close_to_exact(n):
+    pos = np.random.default_rng(n).random((n, 2))
+    k2 = 1.0 / n
+    exact = exact_repulsion(pos, k2)
+    approx = barnes_hut_repulsion(pos, k2)
+    error = np.linalg.norm(approx - exact, axis=1) / np.linalg.norm(exact, axis=1)
+    assert np.median(error) < 0.1
+
+
+@pytest.mark.parametrize("n", [1, 2, 30, 250])
+def test_layout_fills_the_unit_square(n):
+    edges = random_graph(n, 3) if n > 1 else np.zeros((0, 2))
+    pos = force_layout(n, edges, iterations=20)
+    assert pos.shape == (n, 2)
+    assert pos.min() >= 0 and pos.max() <= 1 + 1e-9
+    np.testing.assert_array_equal(pos, force_layout(n, edges, iterations=20))
+
+
+def test_edges_are_shorter_than_non_edges():
+    n = 60
+    edges = random_graph(n, 3)
+    pos = force_layout(n, edges)
+    joined = np.linalg.norm(pos[edges[:, 0]] - pos[edges[:, 1]], axis=1).mean()
+    everything = np.linalg.norm(pos[:, None] - pos[None, :], axis=2).sum() / (n * (n - 1))
+    assert joined < everything / 2
+
+
+def test_fewer_iterations_for_large_graphs():
+    assert default_iterations(layout.FULL_LIMIT) == layout.FULL_ITERATIONS
+    assert default_iterations(10 * layout.FULL_LIMIT) < layout.FULL_ITERATIONS
+    assert default_iterations(10 ** 9) == layout.MIN_ITERATIONS
+
+
+def test_cached_layout_is_written_and_reused(tmp_path, monkeypatch):
+    monkeypatch.setenv("LAYOUT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(layout, "_cache", {})
+    edges = random_graph(20, 3)
+    pos = cached_layout(20, edges, iterations=10)
+    files = list(tmp_path.glob("*.npy"))
+    assert len(files) == 1
+    np.testing.assert_array_equal(np.load(files[0]), pos)
+
+    monkeypatch.setattr(layout, "_cache", {})
+    monkeypatch.setattr(layout, "force_layout", lambda *args: pytest.fail("layout was recomputed"))
+    np.testing.assert_array_equal(cached_layout(20, edges, iterations=10), pos)
+
+
+def test_fit_to_frame_keeps_the_aspect_ratio():
+    points = fit_to_frame([[0, 0], [2, 1]], width=4, height=4, center=(1, 1, 0))
+    np.testing.assert_allclose(points, [[-1, 0, 0], [3, 2, 0]])
+    np.testing.assert_allclose(fit_to_frame([[5, 5]]), [[0, 0, 0]])
@@ -0,0 +1,90 @@
+import itertools
+import random
+
+import pytest
+
+from Common.half import half_construction
+from Common.nfa import EPSILON, NFA, bits, half_trace
+
+
+def random_nfa(rng, n, alphabet="ab", density=0.3, epsilon=0.1):
+    transitions = {}
+    for q in range(n):
+        for symbol in alphabet:
+            targets = [t for t in range(n) if rng.random() < density]
+            if targets:
+                transitions[(q, symbol)] = targets
+        targets = [t for t in range(n) if t != q and rng.random() < epsilon]
+        if targets:
+            transitions[(q, EPSILON)] = targets
+    accepting = [q for q in range(n) if rng.random() < 0.3]
+    return NFA(list(range(n)), 0, accepting, transitions), transitions, set(accepting)
+
+
+# Plain set simulation of an NFA with epsilon moves
+def brute_accepts(n, transitions, accepting, word):
+    def close(states):
+        states = set(states)
+        frontier = list(states)
+        while frontier:
+            q = frontier.pop()
+            for t in transitions.get((q, EPSILON), []):
+                if t not in states:
+                    states.add(t)
+                    frontier.append(t)
+        return states
+
+    current = close({0})
+    for symbol in word:
+        current = close({t for q in current for t in transitions.get((q, symbol), [])})
+    return bool(current & accepting)
+
+
+def words(alphabet, longest):
+    for length in range(longest + 1):
+        for word in itertools.product(alphabet, repeat=length):
+            yield "".join(word)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_accepts_matches_set_simulation(seed):
+    rng = random.Random(seed)
+    nfa, transitions, accepting = random_nfa(rng, rng.randint(1, 12))
+    for word in words("ab", 6):
+        assert nfa.accepts(word) == brute_accepts(nfa.n, transitions, accepting, word), word
+
+
+def test_large_nfa_crosses_chunks():
+    rng = random.Random(1)
+    nfa, transitions, accepting = random_nfa(rng, 40, density=0.05, epsilon=0.02)
+    for word in words("ab", 5):
+        assert nfa.accepts(word) == brute_accepts(nfa.n, transitions, accepting, word), word
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_half_membership_matches_brute_force(seed):
+    rng = random.Random(seed)
+    nfa, _, _ = random_nfa(rng, rng.randint(1, 7))
+    half = half_construction(nfa)
+    built = half.to_nfa()
+    for word in words("ab", 4):
+        expected = nfa.accepts(word + word)
+        assert half.accepts(word) == expected, word
+        assert built.accepts(word) == expected, word
+
+
+def test_half_of_nfa_without_transitions():
+    nfa = NFA(["s", "t"], "s", ["s"], {})
+    half = half_construction(nfa)
+    assert half.accepts("")
+    assert half.reachable == 3
+
+
+def test_half_trace_follows_a_successful_guess():
+    transitions = {("s", "a"): ["a"], ("a", "b"): ["ab"], ("ab", "a"): ["aba"], ("aba", "b"): ["abab"]}
+    nfa = NFA(["s", "a", "ab", "aba", "abab"], "s", ["abab"], transitions)
+    trace = half_trace(nfa, "ab")
+    assert len(trace) == 3
+    p, h, q = trace[-1]
+    assert list(bits(p)) == [h]
+    assert q & nfa.accepting
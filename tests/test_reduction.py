@@ -0,0 +1,60 @@
+import itertools
+import random
+
+import pytest
+
+from Common.reduction import (adjacency, clique_to_dumbbell, find_clique, find_dumbbell, has_clique,
+                              has_dumbbell, random_instance, verify_instance)
+
+
+def brute_has_clique(n, edges, k):
+    edge_set = {frozenset(e) for e in edges}
+    return any(all(frozenset(pair) in edge_set for pair in itertools.combinations(c, 2))
+               for c in itertools.combinations(range(n), k))
+
+
+def brute_has_dumbbell(n, edges, k):
+    edge_set = {frozenset(e) for e in edges}
+    cliques = [set(c) for c in itertools.combinations(range(n), k)
+               if all(frozenset(pair) in edge_set for pair in itertools.combinations(c, 2))]
+    return any(not a & b and any(frozenset((u, v)) in edge_set for u in a for v in b)
+               for a, b in itertools.combinations(cliques, 2))
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_find_clique_matches_combinations(seed):
+    n, edges, _ = random_instance(9, 0.5, 0, seed)
+    adj = adjacency(n, edges)
+    largest = max(k for k in range(n + 1) if brute_has_clique(n, edges, k))
+    clique = find_clique(adj)
+    assert clique.bit_count() == largest
+    members = [v for v in range(n) if clique >> v & 1]
+    assert all(adj[u] >> v & 1 for u, v in itertools.combinations(members, 2))
+    for k in range(1, n + 1):
+        assert has_clique(adj, k) == (k <= largest)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_find_dumbbell_matches_brute_force(seed):
+    n, edges, _ = random_instance(8, 0.5, 0, seed)
+    adj = adjacency(n, edges)
+    for k in (2, 3):
+        assert has_dumbbell(adj, k) == brute_has_dumbbell(n, edges, k)
+        found = find_dumbbell(adj, k)
+        if found is not None:
+            a, b = found
+            assert a.bit_count() == b.bit_count() == k and not a & b
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_reduction_preserves_answers(seed):
+    rng = random.Random(seed)
+    instance = random_instance(rng.randint(4, 8), rng.random(), rng.randint(2, 4), seed)
+    clique, dumbbell = verify_instance(instance)
+    assert clique == dumbbell
+
+
+def test_gadget_shape():
+    n2, edges2, hub = clique_to_dumbbell(3, [(0, 1)], 3)
+    assert (n2, hub) == (6, 3)
+    assert set(edges2) == {(0, 1), (3, 4), (3, 5), (4, 5), (3, 0), (3, 1), (3, 2)}